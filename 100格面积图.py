@@ -1,29 +1,19 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
-from matplotlib import font_manager as fm
+from matplotlib.collections import PolyCollection
 from matplotlib.gridspec import GridSpec
+from matplotlib.colors import to_rgba
 
-def pick_cjk_fontprop():
-    keywords = [
-        "Microsoft YaHei", "msyh", "SimHei", "simhei", "SimSun", "simsun",
-        "PingFang", "Heiti", "Songti",
-        "NotoSansCJK", "Noto Sans CJK", "NotoSansSC", "Noto Sans SC",
-        "WenQuanYi", "SourceHanSans", "Source Han Sans", "Arial Unicode"
-    ]
-    font_files = (
-        fm.findSystemFonts(fontext="ttf")
-        + fm.findSystemFonts(fontext="ttc")
-        + fm.findSystemFonts(fontext="otf")
-    )
-    for kw in keywords:
-        kw_low = kw.lower()
-        for fp in font_files:
-            if kw_low in fp.lower():
-                return fm.FontProperties(fname=fp)
-    return fm.FontProperties(family="sans-serif")
-
-def build_layers_inner_to_outer(stages, values, colors):
+from cjk_font import cjk_fontprop
+
+def _fmt_share(cnt, n_total):
+    """100 格时格数即百分数；其它总格数（如 1000 格的千分比）换算为百分数。"""
+    if n_total == 100:
+        return f"{cnt}%"
+    return f"{100.0 * cnt / n_total:.4g}%"
+
+def build_layers_inner_to_outer(stages, values, colors, n_total=100):
 
     values = np.array(values, dtype=int)
     n = len(values)
@@ -31,40 +21,52 @@ def build_layers_inner_to_outer(stages, values, colors):
     for i in range(n - 1, -1, -1):
         if i == n - 1:
             cnt = int(values[i])
-            label = f"{stages[i]}：{cnt}%"
+            label = f"{stages[i]}：{_fmt_share(cnt, n_total)}"
             col = colors[i]
         else:
             cnt = int(values[i] - values[i + 1])
-            label = f"{stages[i]}（未到下一步）：{cnt}%"
+            label = f"{stages[i]}（未到下一步）：{_fmt_share(cnt, n_total)}"
             col = colors[i]
         layers.append((label, col, cnt))
     return layers  
 
-def waffle_100grid_only_legend(stages, values, colors, n_cols=10, title="用户转化漏斗（100格面积图）"):
-    fp = pick_cjk_fontprop()
+def waffle_cells(counts, n_cols):
+    """
+    counts: 各层格数（由内到外）。格子自下而上、每行自右向左依次填充。
+    返回 (x, y, layer)：每个格子的左下角坐标与所属层号。
+    """
+    counts = np.asarray(counts, dtype=int)
+    layer = np.repeat(np.arange(len(counts)), counts)
+    r, c = np.divmod(np.arange(layer.size), n_cols)
+    return n_cols - 1 - c, r, layer
+
+def waffle_verts(x, y, gap=0.10):
+    """所有格子的正方形顶点，shape (n, 4, 2)。"""
+    x0 = x + gap / 2
+    y0 = y + gap / 2
+    x1 = x0 + 1 - gap
+    y1 = y0 + 1 - gap
+    return np.stack([np.c_[x0, y0], np.c_[x1, y0], np.c_[x1, y1], np.c_[x0, y1]], axis=1)
+
+def waffle_100grid_only_legend(stages, values, colors, n_cols=10, title="用户转化漏斗（100格面积图）",
+                               n_total=100):
+    """
+    漏斗面积图：values[0] == n_total 个格子代表 100%（默认 100 格；1000 格即千分比，
+    也可用每个格子代表一个用户）。所有格子合成一个 PolyCollection，艺术家数量与格数无关。
+    """
+    fp = cjk_fontprop()
 
     values = np.array(values, dtype=int)
-    if values[0] != 100:
-        raise ValueError("该图固定 100 格表示 100%，请保证 values[0] == 100")
+    if values[0] != n_total:
+        raise ValueError(f"共 {n_total} 格表示 100%，请保证 values[0] == {n_total}")
     if not np.all(values[:-1] >= values[1:]):
         raise ValueError("values 必须递减（漏斗）")
 
-    layers_inner_to_outer = build_layers_inner_to_outer(stages, values, colors)
-
-    fills = []
-    for label, col, cnt in layers_inner_to_outer:
-        fills.extend([(label, col)] * cnt)
-    fills = fills[:100]
+    layers_inner_to_outer = build_layers_inner_to_outer(stages, values, colors, n_total)
 
-    n_total = 100
     n_rows = int(np.ceil(n_total / n_cols))
-    coords = []
-    for idx in range(n_total):
-        r = idx // n_cols
-        c = idx % n_cols
-        x = (n_cols - 1 - c)
-        y = r
-        coords.append((x, y))
+    x, y, layer = waffle_cells([cnt for _, _, cnt in layers_inner_to_outer], n_cols)
+    layer_colors = np.array([to_rgba(col) for _, col, _ in layers_inner_to_outer])
 
     fig = plt.figure(figsize=(12.6, 4.6), dpi=160)
     gs = GridSpec(1, 2, figure=fig, width_ratios=[1.45, 0.85], wspace=0.08)
@@ -76,15 +78,13 @@ def waffle_100grid_only_legend(stages, values, colors, n_cols=10, title="用户
     fig.text(0.06, 0.96, title, fontproperties=fp, fontsize=18,
              color="#6e6e6e", ha="left", va="top")
 
-    gap = 0.10
-    for (x, y), (_, col) in zip(coords, fills):
-        ax_grid.add_patch(Rectangle(
-            (x + gap/2, y + gap/2),
-            1 - gap, 1 - gap,
-            facecolor=col,
-            edgecolor="white",
-            linewidth=0.8
-        ))
+    # 格子很多时白边会盖住色块，边线宽度随每格的像素尺寸收窄
+    ax_grid.add_collection(PolyCollection(
+        waffle_verts(x, y, gap=0.10),
+        facecolors=layer_colors[layer],
+        edgecolors="white",
+        linewidths=0.8 * min(1.0, 10.0 / n_cols)
+    ))
     ax_grid.set_xlim(0, n_cols)
     ax_grid.set_ylim(0, n_rows)
     ax_grid.set_aspect("equal")
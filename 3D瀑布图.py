@@ -1,11 +1,20 @@
+import hashlib
+import inspect
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.collections import PolyCollection
-from matplotlib import cm
 
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS"]
 plt.rcParams["axes.unicode_minus"] = False
 
+CURVE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "waterfall"
+
+
+# =========================
+# 1) 数据层：(月 × 日) 曲线矩阵
+# =========================
 def make_month_curve(days, peak_day, peak_height, width, noise=6, seed=None):
     rng = np.random.default_rng(seed)
     x = days.astype(float)
@@ -15,28 +24,122 @@ def make_month_curve(days, peak_day, peak_height, width, noise=6, seed=None):
     y = base + main + sub + rng.normal(0, noise, size=len(x))
     return np.clip(y, 0, None)
 
+def make_curve_matrix(days, peak_days, peak_heights, widths, noise=6, seeds=None):
+    """
+    一次性生成所有月份曲线，返回 shape (n_months, n_days)；
+    第 m 行与 make_month_curve(days, peak_days[m], ..., seed=seeds[m]) 完全一致。
+    """
+    x = days.astype(float)[None, :]
+    peak_days = np.asarray(peak_days, float)[:, None]
+    peak_heights = np.asarray(peak_heights, float)[:, None]
+    widths = np.asarray(widths, float)[:, None]
+    seeds = [None] * len(peak_days) if seeds is None else seeds
+
+    main = peak_heights * np.exp(-0.5 * ((x - peak_days) / widths) ** 2)
+    sub  = 0.35 * peak_heights * np.exp(-0.5 * ((x - (peak_days + 7)) / (widths * 1.2)) ** 2)
+    base = 12 + 2 * np.sin(x / 2.8)
+    eps = np.stack([np.random.default_rng(s).normal(0, noise, size=x.shape[1]) for s in seeds])
+    return np.clip(base + main + sub + eps, 0, None)
+
+def cache_key(*parts):
+    """由数组内容（dtype / shape / 字节）与标量参数计算缓存键。"""
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            arr = np.ascontiguousarray(part)
+            h.update(f"{arr.dtype}{arr.shape}".encode())
+            h.update(arr.tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"|")
+    return h.hexdigest()[:20]
+
+def cached_matrix(build, *key_parts, cache_dir=CURVE_CACHE_DIR):
+    """
+    以 key_parts 的哈希为键，把 build() 的二维结果缓存为 .npz；
+    参数或源数据不变时直接读盘，跳过重新生成。
+    """
+    path = Path(cache_dir) / f"curves_{cache_key(*key_parts)}.npz"
+    if path.exists():
+        with np.load(path) as f:
+            return f["curves"]
+    curves = build()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, curves=curves)
+    return curves
+
+
+# =========================
+# 2) LOD：按像素桶做 min/max 抽稀
+# =========================
+def target_buckets(fig, ax):
+    """坐标轴在目标 figsize/dpi 下的水平像素数，每个像素桶保留一对 min/max。"""
+    return max(2, int(ax.get_position().width * fig.get_figwidth() * fig.dpi))
+
+def minmax_decimate(x, curves, n_buckets):
+    """
+    把每条曲线等分为 n_buckets 个桶，每桶保留最小值与最大值两点（按原顺序），
+    并保留首尾点；峰值与谷值因此不会被抹掉。
+    x: (n,)；curves: (n_slices, n)。返回 (xs, ys)，均为 (n_slices, 2 * n_buckets + 2)。
+    样本数本就不多于 2 * n_buckets + 2 时原样返回（xs 为一维）。
+    """
+    n_slices, n = curves.shape
+    if n <= 2 * n_buckets + 2:
+        return x, curves
+
+    size = -(-n // n_buckets)
+    pad = size * n_buckets - n
+    idx = np.pad(np.arange(n), (0, pad), mode="edge").reshape(n_buckets, size)
+    blocks = curves[:, idx]                                   # (n_slices, n_buckets, size)
+    i_min = np.take_along_axis(idx[None], blocks.argmin(axis=2)[..., None], axis=2)[..., 0]
+    i_max = np.take_along_axis(idx[None], blocks.argmax(axis=2)[..., None], axis=2)[..., 0]
+
+    picked = np.stack([np.minimum(i_min, i_max), np.maximum(i_min, i_max)], axis=2)
+    picked = picked.reshape(n_slices, -1)
+    first = np.zeros((n_slices, 1), dtype=picked.dtype)
+    picked = np.concatenate([first, picked, first + n - 1], axis=1)
+    return x[picked], np.take_along_axis(curves, picked, axis=1)
+
+
+# =========================
+# 3) 渲染层：数组拼接生成多边形顶点
+# =========================
+def waterfall_verts(x, curves):
+    """
+    每条曲线首尾补到 y=0 形成闭合面，返回 shape (n_slices, n_points + 2, 2)。
+    x 可为所有切片共用的一维数组，也可为每个切片各自的二维数组（抽稀后）。
+    """
+    xs = np.broadcast_to(np.asarray(x, float), curves.shape)
+    xs = np.concatenate([xs[:, :1], xs, xs[:, -1:]], axis=1)
+    ys = np.pad(curves, ((0, 0), (1, 1)))
+    return np.stack([xs, ys], axis=-1)
+
 n_months = 12
 days_in_month = 30
 days = np.arange(1, days_in_month + 1)
 
-curves = []
-for m in range(n_months):
-    peak_day = 8 + (m % 4) * 2
-    peak_height = 260 + m * 10
-    width = 2.6 + 0.15 * (m % 3)
-    curves.append(make_month_curve(days, peak_day, peak_height, width, noise=7, seed=100 + m))
+m = np.arange(n_months)
+peak_days = 8 + (m % 4) * 2
+peak_heights = 260 + m * 10
+widths = 2.6 + 0.15 * (m % 3)
+seeds = 100 + m
+noise = 7
+
+curves = cached_matrix(
+    lambda: make_curve_matrix(days, peak_days, peak_heights, widths, noise=noise, seeds=seeds),
+    # 曲线公式改动后源码不同，缓存自动失效
+    inspect.getsource(make_curve_matrix), days, peak_days, peak_heights, widths, seeds, noise
+)
 
 fig = plt.figure(figsize=(10, 8), dpi=160)
 ax = fig.add_subplot(111, projection="3d")
 
-verts = []
-for y in curves:
-    xs = days
-    ys = y
-    verts.append([(xs[0], 0)] + list(zip(xs, ys)) + [(xs[-1], 0)])
+# 小时 / 分钟级数据时每个切片的样本远多于像素，先抽稀再交给 3D 投影与深度排序
+lod_x, lod_curves = minmax_decimate(days, curves, target_buckets(fig, ax))
+verts = waterfall_verts(lod_x, lod_curves)
 
-cmap = cm.get_cmap("Reds")
-facecolors = [cmap(0.45 + 0.5 * (i / (n_months - 1))) for i in range(n_months)]
+cmap = plt.get_cmap("Reds")
+facecolors = cmap(0.45 + 0.5 * np.linspace(0, 1, n_months))
 
 poly = PolyCollection(
     verts,
@@ -51,14 +154,15 @@ ax.add_collection3d(poly, zs=y_positions, zdir="y")
 
 ax.set_xlim(1, days_in_month)
 ax.set_ylim(0.5, n_months + 0.8)
-ax.set_zlim(0, max(np.max(c) for c in curves) * 1.15)
+ax.set_zlim(0, curves.max() * 1.15)
 
 ax.set_xlabel("日", labelpad=10)
 
 
-ax.set_yticks([])  
+ax.set_yticks([])
 
-x_text = days_in_month + 1.0  
+x_text = days_in_month + 1.0
+z_text = 0
 for i, y in enumerate(y_positions, start=1):
     ax.text(x_text, y, z_text, f"{i}月", ha="left", va="center", fontsize=10)
 
@@ -3,6 +3,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle, FancyBboxPatch
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.path import Path
 from matplotlib.ticker import FuncFormatter
 
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS", "DejaVu Sans"]
@@ -63,61 +66,65 @@ def plot_marimekko(widths, composition, colors, *,
 
     ax.set_title(title, fontsize=14, pad=18, color="#2B3A47")
 
-    x_left = 0.0
-    for i, cat in enumerate(categories):
-        width_i = float(w.loc[cat])
-
-        clip = FancyBboxPatch(
-            (x_left, 0), width_i, 1.0,
-            boxstyle=f"round,pad=0,rounding_size={rounding}",
-            linewidth=0,
-            facecolor="none"
+    # 一次性转成 NumPy：x 方向按列宽累计，y 方向按各列构成累计
+    C = comp.to_numpy()                              # (n_seg, n_cat)
+    widths_arr = w.to_numpy()
+    x_lefts = np.r_[0.0, np.cumsum(widths_arr[:-1] + gap)]
+    y_bottoms = np.cumsum(C, axis=0) - C
+
+    # 各列圆角外框合成一条复合裁剪路径，所有色块共用
+    clip_path = Path.make_compound_path(*[
+        FancyBboxPatch(
+            (x0, 0), wi, 1.0,
+            boxstyle=f"round,pad=0,rounding_size={rounding}"
+        ).get_path()
+        for x0, wi in zip(x_lefts, widths_arr)
+    ])
+
+    # 每个系列（产品）一个 PolyCollection
+    for k, seg in enumerate(comp.index):
+        keep = C[k] > 0
+        x0 = x_lefts[keep]
+        x1 = x0 + widths_arr[keep]
+        y0 = y_bottoms[k, keep]
+        y1 = y0 + C[k, keep]
+        verts = np.stack([
+            np.c_[x0, y0], np.c_[x1, y0], np.c_[x1, y1], np.c_[x0, y1]
+        ], axis=1)
+
+        coll = PolyCollection(
+            verts,
+            facecolors=colors.get(seg, "#999999"),
+            edgecolors="white",
+            linewidths=2.0
         )
-        ax.add_patch(clip)
-
-        y_bottom = 0.0
-        for seg in comp.index:
-            h = float(comp.loc[seg, cat])
-            if h <= 0:
-                continue
-
-            rect = Rectangle(
-                (x_left, y_bottom),
-                width_i, h,
-                facecolor=colors.get(seg, "#999999"),
-                edgecolor="white",
-                linewidth=2.0
-            )
-            rect.set_clip_path(clip)
-            ax.add_patch(rect)
-
-            if show_segment_labels and h >= segment_label_min_height:
-                cx = x_left + width_i / 2
-                cy = y_bottom + h / 2
-                fc = rect.get_facecolor()
+        coll.set_clip_path(clip_path, ax.transData)
+        ax.add_collection(coll)
+
+        if show_segment_labels:
+            text_color = _best_text_color(to_rgba(colors.get(seg, "#999999")))
+            show = C[k] >= segment_label_min_height
+            for cx, cy, h in zip((x_lefts + widths_arr / 2)[show],
+                                 (y_bottoms[k] + C[k] / 2)[show],
+                                 C[k, show]):
                 ax.text(
                     cx, cy,
                     f"{seg}\n{h*100:.0f}%",
                     ha="center", va="center",
                     fontsize=10,
-                    color=_best_text_color(fc),
+                    color=text_color,
                     clip_on=True
                 )
 
-            y_bottom += h
-
+    for cat, cx in zip(categories, x_lefts + widths_arr / 2):
         ax.text(
-            x_left + width_i / 2, 1.02,
+            cx, 1.02,
             str(cat),
             ha="center", va="bottom",
             fontsize=12, color="#1E2A36",
             fontweight="bold"
         )
 
-        x_left += width_i
-        if i < n - 1:
-            x_left += gap
-
     handles = [Rectangle((0, 0), 1, 1, facecolor=colors[s], edgecolor="none") for s in comp.index]
     ax.legend(
         handles, comp.index.tolist(),
@@ -0,0 +1,204 @@
+"""
+批量渲染入口（无界面 / Agg 后端）
+
+每个图表脚本都在模块顶层作图并以 plt.show() 结束，逐个启动解释器会重复支付
+matplotlib 导入与字体缓存的开销。这里把每个脚本包装成一个可调用对象，
+在 ProcessPoolExecutor 中并行渲染：
+- 每个 worker 进程只预热一次（Agg 后端、pyplot、字体缓存）
+- 每个图表运行结束后，把其打开的所有 Figure 按指定格式写入目标目录
+
+用法：
+    python batch_render.py -o out                    # 渲染全部图表为 PNG
+    python batch_render.py -o out -f png svg -j 8    # PNG + SVG，8 个进程
+    python batch_render.py -o out 旭日图 径向柱状图    # 只渲染指定图表
+    CHART_PROFILE=1 python batch_render.py -o out    # 同时写出分阶段剖析（见 render_profile.py）
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+
+from render_profile import profile_enabled, profile_render
+
+ROOT = Path(__file__).resolve().parent
+
+
+# =========================
+# 1) 发现图表脚本
+# =========================
+def discover_charts(root=ROOT):
+    """
+    图表脚本均以中文命名；英文文件名的是公共模块（如本文件），不参与渲染。
+    返回按文件名排序的脚本路径列表。
+    """
+    root = Path(root)
+    return sorted(p for p in root.glob("*.py") if not p.stem.isascii())
+
+
+def select_charts(names, root=ROOT):
+    """按脚本名（可省略 .py，首尾空格忽略）筛选图表。"""
+    charts = discover_charts(root)
+    if not names:
+        return charts
+    by_name = {p.stem.strip(): p for p in charts}
+    picked = []
+    for name in names:
+        key = name[:-3] if name.endswith(".py") else name
+        key = key.strip()
+        if key not in by_name:
+            raise SystemExit(f"未找到图表脚本：{name}")
+        picked.append(by_name[key])
+    return picked
+
+
+# =========================
+# 2) worker 预热
+# =========================
+def warm_worker():
+    """
+    进程池 initializer：每个 worker 只执行一次。
+    选定 Agg 后端并提前加载 pyplot 与字体缓存，后续图表直接复用。
+    """
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot  # noqa: F401
+    from matplotlib import font_manager
+    font_manager.fontManager.ttflist  # 触发字体缓存加载
+
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+
+# =========================
+# 3) 图表 -> 可调用对象
+# =========================
+def load_chart(path):
+    """
+    把图表脚本包装成可调用对象：调用时以 __main__ 身份执行脚本，
+    屏蔽 plt.show()，并返回脚本创建的全部 Figure。
+    调用开始时先把 rcParams 恢复为 matplotlibrc 的默认值：脚本设置的字体、savefig.*
+    等在之后保存 / 绘制这些 Figure 时仍然有效，也不会串到同一 worker 的下一张图。
+    """
+    path = Path(path)
+
+    def render():
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        plt.close("all")
+        show = plt.show
+        plt.show = lambda *args, **kwargs: None
+        mpl.rc_file_defaults()
+        try:
+            runpy.run_path(str(path), run_name="__main__")
+            figs = [plt.figure(n) for n in plt.get_fignums()]
+        finally:
+            plt.show = show
+        return figs
+
+    render.__name__ = path.stem.strip()
+    return render
+
+
+def render_chart(path, out_dir, formats=("png",), dpi=None):
+    """
+    在当前（已预热的）进程中渲染一张图表，返回结果字典：
+    {"chart", "files", "seconds", "error"}
+    脚本自身 savefig 写出的相对路径文件也会落在 out_dir 中。
+    设置了 CHART_PROFILE 时另写出 <图表>.profile.json 与 <图表>.trace.json。
+    """
+    import matplotlib.pyplot as plt
+
+    path = Path(path)
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = path.stem.strip()
+
+    t0 = time.perf_counter()
+    files, error = [], None
+    cwd = os.getcwd()
+    os.chdir(out_dir)
+    profiling = profile_render(name) if profile_enabled() else nullcontext()
+    try:
+        with profiling as prof:
+            figs = load_chart(path)()
+            if not figs:
+                raise RuntimeError(f"{name} 没有留下任何 Figure，未写出图表文件")
+            for i, fig in enumerate(figs, start=1):
+                suffix = "" if len(figs) == 1 else f"_{i}"
+                for fmt in formats:
+                    target = out_dir / f"{name}{suffix}.{fmt}"
+                    fig.savefig(target, format=fmt, dpi=dpi or "figure")
+                    files.append(str(target))
+        if prof is not None:
+            files.append(str(prof.write_report(out_dir / f"{name}.profile.json")))
+            files.append(str(prof.write_trace(out_dir / f"{name}.trace.json")))
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        os.chdir(cwd)
+        plt.close("all")
+
+    return {
+        "chart": name,
+        "files": files,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "error": error,
+    }
+
+
+# =========================
+# 4) 并行批量渲染
+# =========================
+def render_all(charts, out_dir, formats=("png",), dpi=None, jobs=None):
+    """
+    用进程池并行渲染 charts，按完成顺序返回结果列表。
+    jobs=1 时在当前进程内顺序执行（便于调试）。
+    """
+    charts = [Path(p) for p in charts]
+    formats = tuple(formats)
+
+    if jobs == 1:
+        warm_worker()
+        return [render_chart(p, out_dir, formats, dpi) for p in charts]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=warm_worker) as pool:
+        futures = [pool.submit(render_chart, p, out_dir, formats, dpi) for p in charts]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无界面批量渲染全部图表脚本")
+    parser.add_argument("charts", nargs="*", help="只渲染这些图表（脚本名，可省略 .py）")
+    parser.add_argument("-o", "--out-dir", default="rendered", help="输出目录")
+    parser.add_argument("-f", "--formats", nargs="+", default=["png"], help="输出格式，如 png svg")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="进程数，默认 CPU 核数")
+    parser.add_argument("--dpi", type=float, default=None, help="覆盖输出 dpi，默认使用各图表自身 dpi")
+    args = parser.parse_args(argv)
+
+    charts = select_charts(args.charts)
+    t0 = time.perf_counter()
+    results = render_all(charts, args.out_dir, args.formats, args.dpi, args.jobs)
+
+    failed = [r for r in results if r["error"]]
+    for r in sorted(results, key=lambda r: r["chart"]):
+        status = "FAIL" if r["error"] else "ok"
+        print(f"[{status:>4}] {r['seconds']:7.2f}s  {r['chart']}")
+    for r in failed:
+        print(f"\n--- {r['chart']} ---\n{r['error']}", file=sys.stderr)
+
+    print(f"\n{len(results) - len(failed)}/{len(results)} 张图表完成，用时 {time.perf_counter() - t0:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+"""
+图表基准测试（无界面 / Agg 后端）
+
+对各图表的作图函数，用 1× / 10× / 100× / 1000× 样例数据规模的合成输入逐一运行，
+分阶段记录耗时、内存与 Figure 中的艺术家数量：
+- data     生成合成输入
+- build    调用作图函数（创建艺术家；函数内部自带 tight_layout / savefig 的也计入此阶段）
+- draw     fig.canvas.draw()：布局 + Agg 光栅化
+- encode   把已光栅化的画布编码为 PNG（不重复绘制）
+分页生成器（如 facet_pages）会在取下一页时关闭上一页，这类用例在 build 中逐页绘制并编码。
+每个（图表, 规模）都在独立子进程（及用完即删的临时工作目录）中运行，峰值内存互不干扰，
+超时或内存不足只记为该项失败。
+内存取 ru_maxrss，即进程至今的峰值，只增不减：各阶段记录 process_peak_rss_mb
+（截至该阶段结束的进程峰值）与 rss_growth_mb（该阶段使峰值上升了多少）；
+结果中的 process_peak_rss_mb 为整次运行的进程峰值。
+
+没有作图函数、只在模块顶层作图的脚本，可用 --scripts 以样例数据（1×）整体计时；
+这些脚本会列在结果 JSON 的 unscaled_charts 中。
+
+用法：
+    python bench_charts.py                              # 全部用例、全部规模，写 bench_results.json
+    python bench_charts.py marimekko waffle -s 1 10     # 指定用例与规模
+    python bench_charts.py --scripts                    # 所有图表脚本（样例数据）
+    python bench_charts.py -o new.json --baseline old.json   # 与上次结果对比，变慢超过阈值时返回 1
+"""
+
+import argparse
+import io
+import json
+import platform
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parent
+SCALES = (1, 10, 100, 1000)
+PHASES = ("data", "build", "draw", "encode")
+SCRIPT_JOB = "@script"
+
+
+# =========================
+# 1) 测量
+# =========================
+def peak_rss_mb():
+    """本进程迄今为止的峰值 RSS（MB）；平台不支持时返回 None。"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def open_figures():
+    import matplotlib.pyplot as plt
+    return [plt.figure(n) for n in plt.get_fignums()]
+
+def count_artists(figs):
+    """Figure 树中的全部艺术家（含坐标轴、刻度、文本）；一个 Collection 只算一个。"""
+    return sum(len(fig.findobj()) for fig in figs)
+
+def run_phase(phases, name, fn):
+    """
+    执行 fn 并把 {seconds, process_peak_rss_mb, rss_growth_mb, artists} 记入 phases[name]，
+    返回 fn 的结果。
+    """
+    before = peak_rss_mb()
+    t0 = time.perf_counter()
+    out = fn()
+    seconds = time.perf_counter() - t0
+    after = peak_rss_mb()
+    phases[name] = {
+        "seconds": round(seconds, 4),
+        "process_peak_rss_mb": after,
+        "rss_growth_mb": None if after is None else round(after - before, 1),
+        "artists": count_artists(open_figures()),
+    }
+    return out
+
+def draw_all(figs):
+    for fig in figs:
+        fig.canvas.draw()
+
+def encode_all(figs):
+    """只做 PNG 编码：直接读取 draw 阶段留下的 RGBA 缓冲，不触发重绘。"""
+    from matplotlib import image as mpimg
+
+    size = 0
+    for fig in figs:
+        buf = io.BytesIO()
+        mpimg.imsave(buf, np.asarray(fig.canvas.buffer_rgba()), format="png", dpi=fig.dpi)
+        size += buf.tell()
+    return size
+
+def render_pages(pages):
+    """逐页绘制并编码分页生成器产出的 Figure（取下一页时上一页已关闭），返回编码总字节数。"""
+    size = 0
+    for fig in pages:
+        draw_all([fig])
+        size += encode_all([fig])
+    return size
+
+
+# =========================
+# 2) 用例：合成输入随 scale 线性放大
+# =========================
+CASES = {}
+
+def bench_case(name, script):
+    """
+    登记一个用例。被装饰的函数签名为 (ns, scale)：ns 为图表脚本的模块命名空间，
+    负责生成 scale 倍规模的输入，并返回一个无参的作图调用。
+    """
+    def register(fn):
+        CASES[name] = (script, fn)
+        return fn
+    return register
+
+def _rng(scale):
+    return np.random.default_rng(1000 + scale)
+
+@bench_case("marimekko", "Marimekko图.py")
+def _marimekko(ns, scale):
+    import pandas as pd
+
+    rng = _rng(scale)
+    n = 4 * scale
+    cats = [f"国家 {i + 1}" for i in range(n)]
+    products = ["产品 1", "产品 2", "产品 3"]
+    widths = pd.Series(rng.integers(5, 50, n).astype(float), index=cats)
+    comp = pd.DataFrame(rng.integers(5, 60, (len(products), n)), index=products, columns=cats)
+    colors = dict(zip(products, ["#111B2E", "#B91D2D", "#FF3B30"]))
+    # 默认间隙在几百个类别时放不下，按类别数等比缩小
+    return lambda: ns["plot_marimekko"](
+        widths, comp, colors, gap=0.006 / scale, rounding=0.015 / scale, title="基准"
+    )
+
+@bench_case("polar_area", "极坐标图.py")
+def _polar_area(ns, scale):
+    months, products, values = ns["make_virtual_sales"](n_months=12 * scale)
+    return lambda: ns["plot_polar_area"](months, products, values, save_path="polar_area.png")
+
+@bench_case("waffle", "100格面积图.py")
+def _waffle(ns, scale):
+    n_total = 100 * scale
+    stages = ["首页浏览", "点击浏览", "加购", "下单", "支付成功"]
+    values = [v * scale for v in (100, 85, 43, 25, 15)]
+    colors = ["#D9D9D9", "#8FD3E8", "#00A6D6", "#FF8C42", "#1F4E79"]
+    n_cols = int(round(10 * np.sqrt(scale)))
+    return lambda: ns["waffle_100grid_only_legend"](
+        stages, values, colors, n_cols=n_cols, n_total=n_total
+    )
+
+@bench_case("slopegraph", "双时间点变化图.py")
+def _slopegraph(ns, scale):
+    rng = _rng(scale)
+    n = 7 * scale
+    v14 = rng.integers(20, 100, n)
+    v15 = np.clip(v14 + rng.integers(-15, 16, n), 20, 100)
+    items = [(f"维度{i}", int(a), int(b), i % 7 == 4) for i, (a, b) in enumerate(zip(v14, v15))]
+    return lambda: ns["slopegraph_employee_feedback"](items=items)
+
+@bench_case("treemap", "比例面积图.py")
+def _treemap(ns, scale):
+    rng = _rng(scale)
+    values = {f"K{i}": float(v) for i, v in enumerate(rng.lognormal(5, 0.8, 5 * scale))}
+    return lambda: ns["draw_treemap"](values, {}, out_png="treemap.png")
+
+@bench_case("facets", "分面折线图.py")
+def _facets(ns, scale):
+    rng = _rng(scale)
+    years = ns["years"]
+    data = {f"类别{i}": rng.uniform(5, 60, len(years)) for i in range(8 * scale)}
+    return lambda: render_pages(ns["facet_pages"](data, years, per_page=20))
+
+@bench_case("databar_table", "表格 + 条形数据条.py")
+def _databar_table(ns, scale):
+    import pandas as pd
+
+    rng = _rng(scale)
+    n = 13 * scale
+    df = pd.DataFrame({
+        "国家": [f"国家{i}" for i in range(n)],
+        "Y25达成": rng.lognormal(7, 1.5, n).round(1),
+        "绝对值增长": rng.normal(0, 2000, n).round(1),
+        "同比": rng.normal(0.3, 1.0, n).round(2),
+    })
+    # 分页窗口：整表参与取值范围计算，只渲染第一页
+    return lambda: ns["draw_databar_table"](df, rows=30)
+
+@bench_case("ring_bars", "消费总量环形柱状图.py")
+def _ring_bars(ns, scale):
+    rng = _rng(scale)
+    n = 15 * scale
+    return lambda: ns["plot_ring_bars"]([f"类别{i}" for i in range(n)], rng.lognormal(6, 0.5, n).tolist())
+
+@bench_case("stage_lines", "分组阶段折线图.py")
+def _stage_lines(ns, scale):
+    rng = _rng(scale)
+    data = {f"产品{i}": rng.integers(0, 100, 4).tolist() for i in range(4 * scale)}
+    return lambda: ns["plot_stage_lines"](data, ["Q1", "Q2", "Q3", "Q4"], "产品0")
+
+@bench_case("sales_trend", "组合趋势分析图.py")
+def _sales_trend(ns, scale):
+    rng = _rng(scale)
+    n = 12 * scale
+    months = np.arange(1, n + 1)
+    values = rng.integers(100, 300, n)
+    trend_pct = rng.integers(-40, 80, n)
+    return lambda: ns["plot_sales_trend"](months, values, trend_pct, current_month=n)
+
+@bench_case("sunburst", "旭日图.py")
+def _sunburst(ns, scale):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    rng = _rng(scale)
+    n = 4 * scale
+    table = pd.DataFrame({
+        "path": [(f"国家{i}", f"品类{j}") for i in range(n) for j in range(4)],
+        "value": rng.integers(50, 450, 4 * n),
+    })
+
+    def build():
+        fig, ax = plt.subplots(figsize=(8, 8), dpi=160)
+        ax.set_aspect("equal")
+        ax.axis("off")
+        rings = ns["sunburst_layout"](table)
+        ns["draw_sunburst"](ax, rings, ns["sunburst_colors"](rings, ns["base_colors"]), (0.38, 0.62, 0.94))
+        ax.autoscale_view()
+        return fig
+    return build
+
+@bench_case("waterfall_3d", "3D瀑布图.py")
+def _waterfall_3d(ns, scale):
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PolyCollection
+
+    # 按日 -> 更细的采样：每个切片 30 * scale 个点，走脚本自身的抽稀与顶点拼接
+    n_months = 12
+    m = np.arange(n_months)
+    days = np.linspace(1, 30, 30 * scale)
+    curves = ns["make_curve_matrix"](
+        days, 8 + (m % 4) * 2, 260 + m * 10, 2.6 + 0.15 * (m % 3), noise=7, seeds=100 + m
+    )
+
+    def build():
+        fig = plt.figure(figsize=(10, 8), dpi=160)
+        ax = fig.add_subplot(111, projection="3d")
+        lod_x, lod_curves = ns["minmax_decimate"](days, curves, ns["target_buckets"](fig, ax))
+        poly = PolyCollection(ns["waterfall_verts"](lod_x, lod_curves), edgecolors="white", linewidths=1.2)
+        ax.add_collection3d(poly, zs=np.arange(1, n_months + 1), zdir="y")
+        ax.set_xlim(1, 30)
+        ax.set_ylim(0.5, n_months + 0.8)
+        ax.set_zlim(0, curves.max() * 1.15)
+        return fig
+    return build
+
+
+# =========================
+# 3) 单次运行（子进程内）
+# =========================
+def _prepare_process(mem_limit_mb=None):
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
+    plt.show = lambda *args, **kwargs: None
+
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    if mem_limit_mb and resource is not None:
+        limit = int(mem_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def load_namespace(script):
+    """执行图表脚本（不以 __main__ 身份，__main__ 块不会运行）并返回其命名空间。"""
+    import matplotlib.pyplot as plt
+
+    ns = runpy.run_path(str(ROOT / script), run_name="__bench__")
+    plt.close("all")
+    return ns
+
+def run_case(name, scale):
+    """在当前进程中运行一个用例，返回结果字典。"""
+    import matplotlib.pyplot as plt
+
+    script, make = CASES[name]
+    phases, error = {}, None
+    try:
+        ns = run_phase(phases, "setup", lambda: load_namespace(script))
+        build = run_phase(phases, "data", lambda: make(ns, scale))
+        run_phase(phases, "build", build)
+        figs = open_figures()
+        run_phase(phases, "draw", lambda: draw_all(figs))
+        run_phase(phases, "encode", lambda: encode_all(figs))
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        plt.close("all")
+    return _result(name, scale, phases, error)
+
+def run_script(path):
+    """以样例数据（1×）整体运行一个模块顶层作图的图表脚本。"""
+    import matplotlib.pyplot as plt
+    from batch_render import load_chart
+
+    phases, error = {}, None
+    try:
+        figs = run_phase(phases, "build", load_chart(path))
+        run_phase(phases, "draw", lambda: draw_all(figs))
+        run_phase(phases, "encode", lambda: encode_all(figs))
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        plt.close("all")
+    return _result(Path(path).stem.strip(), 1, phases, error)
+
+def unscaled_charts():
+    """没有按规模放大的用例、只能以 --scripts 样例数据计时的图表脚本（文件名）。"""
+    from batch_render import discover_charts
+
+    covered = {script for script, _ in CASES.values()}
+    return [p.name for p in discover_charts() if p.name not in covered]
+
+def _result(name, scale, phases, error):
+    return {
+        "case": name,
+        "scale": scale,
+        "phases": phases,
+        "total_seconds": round(sum(phases[p]["seconds"] for p in PHASES if p in phases), 4),
+        "process_peak_rss_mb": max((v["process_peak_rss_mb"] or 0 for v in phases.values()), default=None),
+        "artists": phases.get("encode", phases.get("build", {})).get("artists"),
+        "error": error,
+    }
+
+
+# =========================
+# 4) 调度：每次运行一个子进程
+# =========================
+def run_isolated(args, timeout, mem_limit_mb):
+    """
+    在子进程中运行 --child args，返回其输出的结果字典（超时 / 崩溃时记为失败）。
+    子进程在临时目录中运行（脚本自身 savefig 写出的文件落在这里），结束后连同目录删除。
+    """
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", *map(str, args)]
+    if mem_limit_mb:
+        cmd += ["--mem-limit-mb", str(mem_limit_mb)]
+    if args[0] == SCRIPT_JOB:
+        name, scale = Path(args[1]).stem.strip(), 1
+    else:
+        name, scale = args[0], int(args[1])
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+            proc = subprocess.run(cmd, cwd=workdir, capture_output=True, text=True,
+                                  encoding="utf-8", timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return _result(name, scale, {}, f"timeout after {timeout}s")
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return _result(name, scale, {}, f"exit code {proc.returncode}\n{proc.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+def environment():
+    import matplotlib
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare(results, baseline, threshold):
+    """按（用例, 规模）对比总耗时，返回变慢超过 threshold 倍的条目。"""
+    before = {(r["case"], r["scale"]): r for r in baseline["results"] if not r["error"]}
+    regressions = []
+    for r in results:
+        old = before.get((r["case"], r["scale"]))
+        if old is None or r["error"] or not old["total_seconds"]:
+            continue
+        ratio = r["total_seconds"] / old["total_seconds"]
+        r["vs_baseline"] = round(ratio, 3)
+        if ratio > threshold:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="图表基准测试：分阶段耗时 / 峰值内存 / 艺术家数量")
+    parser.add_argument("cases", nargs="*", help=f"用例名，默认全部：{', '.join(CASES)}")
+    parser.add_argument("-s", "--scales", nargs="+", type=int, default=list(SCALES), help="数据规模倍数")
+    parser.add_argument("--scripts", action="store_true", help="改为以样例数据运行全部图表脚本")
+    parser.add_argument("-o", "--out", default="bench_results.json", help="JSON 结果路径")
+    parser.add_argument("--timeout", type=float, default=300, help="单次运行超时（秒）")
+    parser.add_argument("--mem-limit-mb", type=int, default=None, help="单次运行的地址空间上限（仅类 Unix）")
+    parser.add_argument("--baseline", help="上一次的 JSON 结果，用于对比")
+    parser.add_argument("--threshold", type=float, default=1.25, help="总耗时超过基线该倍数即视为退化")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _prepare_process(args.mem_limit_mb)
+        if args.child[0] == SCRIPT_JOB:
+            result = run_script(args.child[1])
+        else:
+            result = run_case(args.child[0], int(args.child[1]))
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+
+    if args.scripts:
+        from batch_render import select_charts
+        jobs = [(SCRIPT_JOB, str(p)) for p in select_charts(args.cases)]
+    else:
+        unknown = [c for c in args.cases if c not in CASES]
+        if unknown:
+            raise SystemExit(f"未知用例：{', '.join(unknown)}（可选：{', '.join(CASES)}）")
+        jobs = [(c, s) for c in (args.cases or CASES) for s in args.scales]
+
+    results = []
+    for job in jobs:
+        r = run_isolated(job, args.timeout, args.mem_limit_mb)
+        results.append(r)
+        status = "FAIL" if r["error"] else "ok"
+        print(f"[{status:>4}] {r['case']:<24} {r['scale']:>5}x  {r['total_seconds']:8.3f}s  "
+              f"process peak rss {r['process_peak_rss_mb'] or 0:8.1f} MB  artists {r['artists'] or 0}")
+
+    report = {"environment": environment(), "results": results}
+    if not args.scripts:
+        report["unscaled_charts"] = unscaled_charts()
+        print(f"\n未按规模放大（仅 --scripts 以样例数据计时）的图表 {len(report['unscaled_charts'])} 个："
+              f"{', '.join(report['unscaled_charts'])}")
+    code = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"[SLOW] {r['case']} {r['scale']}x：{r['vs_baseline']:.2f} 倍于基线", file=sys.stderr)
+        code = 1 if regressions else 0
+
+    Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n结果已写入 {args.out}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+中文字体解析（供所有图表脚本共用）
+
+扫描系统字体（fm.findSystemFonts + 关键字匹配）在字体很多的机器上要好几秒。
+这里只扫描一次，把解析到的字体路径写入 .cache/cjk_font.json；
+之后各脚本直接读缓存，只有字体目录的 mtime 变化（安装 / 删除字体）时才重新扫描。
+
+用法：
+    from cjk_font import use_cjk_font, cjk_fontprop
+
+    use_cjk_font()           # 注册字体并写入 rcParams["font.sans-serif"]
+    fp = cjk_fontprop()      # 需要显式 FontProperties 时
+"""
+
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import matplotlib as mpl
+from matplotlib import font_manager as fm
+
+ROOT = Path(__file__).resolve().parent
+FONT_CACHE = ROOT / ".cache" / "cjk_font.json"
+
+# 按优先级排列：先按字体文件路径关键字匹配，再按已登记的字体族名匹配
+FILE_KEYWORDS = [
+    "msyh", "microsoft yahei", "simhei", "simsun",
+    "pingfang", "heiti", "songti",
+    "notosanscjk", "noto sans cjk", "notosanssc", "noto sans sc",
+    "wenquanyi", "wqy", "sourcehansans", "source han sans", "arial unicode",
+]
+FAMILY_NAMES = [
+    "Microsoft YaHei", "SimHei", "SimSun",
+    "PingFang SC", "Heiti SC", "Songti SC",
+    "Noto Sans CJK SC", "Source Han Sans SC", "Source Han Sans CN",
+    "WenQuanYi Micro Hei", "Arial Unicode MS",
+]
+
+
+# =========================
+# 1) 缓存失效依据：字体目录 mtime
+# =========================
+def font_directories():
+    """本平台上 matplotlib 会搜索的字体目录中，实际存在的那些。"""
+    if sys.platform == "win32":
+        dirs = [fm.win32FontDirectory(), *fm.MSUserFontDirectories]
+    elif sys.platform == "darwin":
+        dirs = [*fm.X11FontDirectories, *fm.OSXFontDirectories]
+    else:
+        dirs = list(fm.X11FontDirectories)
+    return [d for d in dict.fromkeys(dirs) if os.path.isdir(d)]
+
+def font_dirs_signature():
+    """
+    字体目录（含子目录）的数量与最新 mtime。
+    安装或删除字体文件会更新其所在目录的 mtime；只 stat 目录，不解析字体文件。
+    """
+    n_dirs, latest = 0, 0.0
+    for top in font_directories():
+        for dirpath, _, _ in os.walk(top):
+            try:
+                latest = max(latest, os.stat(dirpath).st_mtime)
+            except OSError:
+                continue
+            n_dirs += 1
+    return f"{n_dirs}:{latest:.6f}"
+
+
+# =========================
+# 2) 全量扫描（仅缓存失效时执行）
+# =========================
+def scan_cjk_font():
+    """返回第一个匹配的中文字体文件路径；找不到时返回 None。"""
+    font_files = sorted(fm.findSystemFonts())
+    lowered = [fp.lower() for fp in font_files]
+    for kw in FILE_KEYWORDS:
+        for fp, low in zip(font_files, lowered):
+            if kw in low:
+                return fp
+
+    by_name = {f.name: f.fname for f in fm.fontManager.ttflist}
+    for name in FAMILY_NAMES:
+        if name in by_name:
+            return by_name[name]
+    return None
+
+
+# =========================
+# 3) 对外接口
+# =========================
+@lru_cache(maxsize=None)
+def resolve_cjk_font_path(cache_path=FONT_CACHE):
+    """
+    中文字体路径：磁盘缓存的目录签名一致时直接返回，否则重新扫描并写回缓存。
+    同一进程内只解析一次。
+    """
+    cache_path = Path(cache_path)
+    signature = font_dirs_signature()
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = {}
+
+    path = cached.get("path")
+    if cached.get("signature") == signature and (path is None or os.path.exists(path)):
+        return path
+
+    path = scan_cjk_font()
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"signature": signature, "path": path}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    return path
+
+def cjk_fontprop():
+    """中文字体的 FontProperties；找不到时退回默认无衬线字体。"""
+    path = resolve_cjk_font_path()
+    if path:
+        return fm.FontProperties(fname=path)
+    return fm.FontProperties(family=["sans-serif"])
+
+def use_cjk_font():
+    """
+    注册中文字体并放到 rcParams["font.sans-serif"] 首位，同时关闭 unicode 负号。
+    返回字体族名；找不到中文字体时返回 None（rcParams 字体保持不变）。
+    """
+    mpl.rcParams["axes.unicode_minus"] = False
+    path = resolve_cjk_font_path()
+    if path is None:
+        return None
+
+    fm.fontManager.addfont(path)
+    name = fm.FontProperties(fname=path).get_name()
+    mpl.rcParams["font.sans-serif"] = [name] + [
+        f for f in mpl.rcParams["font.sans-serif"] if f != name
+    ]
+    return name
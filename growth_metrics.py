@@ -0,0 +1,91 @@
+"""
+同比 / 环比 / 占比 / 季度汇总（供各对比类图表共用）
+
+输入为 (主体 × 期间) 的二维数组，例如 5000 家门店 × 12 个月；
+一维数组（单个主体）与标量同样适用。所有指标都在整块数组上向量化计算：
+- 分母为 0 或缺失（NaN）时结果为 NaN，不会抛出除零警告
+- 比率均为小数（0.12 表示 +12%），需要百分数时自行乘 100
+
+用法：
+    from growth_metrics import growth_metrics, yoy
+
+    m = growth_metrics(rev_2025, rev_2024)
+    m["yoy"], m["mom"], m["share"], m["q_yoy"], m["total_yoy"]
+"""
+
+import numpy as np
+
+
+def safe_ratio(num, den):
+    """num / den；den 为 0 或任一侧为 NaN 时返回 NaN。标量输入返回标量。"""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    shape = np.broadcast_shapes(num.shape, den.shape)
+    out = np.full(shape, np.nan)
+    np.divide(num, den, out=out, where=(den != 0) & ~np.isnan(den))
+    return out[()]
+
+def yoy(cur, prev):
+    """同比：cur / prev - 1（按位置对齐，如本年各月 vs 上年同月）。"""
+    return safe_ratio(cur, prev) - 1
+
+def prev_for_mom(cur, prev=None):
+    """
+    环比基数：每期的上一期。首期取上一年度的最后一期（1 月 vs 上年 12 月）；
+    不提供 prev 时首期基数为 NaN。沿最后一维计算。
+    """
+    cur = np.asarray(cur, dtype=float)
+    if prev is None:
+        first = np.full(cur.shape[:-1] + (1,), np.nan)
+    else:
+        first = np.asarray(prev, dtype=float)[..., -1:]
+    return np.concatenate([first, cur[..., :-1]], axis=-1)
+
+def mom(cur, prev=None):
+    """环比：cur / 上一期 - 1，基数见 prev_for_mom。"""
+    return safe_ratio(cur, prev_for_mom(cur, prev)) - 1
+
+def share(values, axis=-1):
+    """占比：各期占合计的比例；缺失值不计入合计，也不参与占比。"""
+    values = np.asarray(values, dtype=float)
+    return safe_ratio(values, np.nansum(values, axis=axis, keepdims=True))
+
+def period_rollup(values, size=3):
+    """
+    沿最后一维每 size 期合计一次（默认按季度），NaN 视为缺失；
+    某个区间全部缺失时结果为 NaN。期数须为 size 的整数倍。
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    if n % size:
+        raise ValueError(f"期数 {n} 不是 {size} 的整数倍")
+    starts = np.arange(0, n, size)
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=-1)
+    counts = np.add.reduceat(valid.astype(int), starts, axis=-1)
+    return np.where(counts > 0, sums, np.nan)
+
+def growth_metrics(cur, prev, quarter_size=3):
+    """
+    一次计算本期 vs 上期（如本年 vs 上年）的全部对比指标，返回 dict：
+      yoy, mom, share              与 cur 同形状
+      q_cur, q_prev, q_yoy         季度合计及季度同比，最后一维为 n_periods / quarter_size
+      total_cur, total_prev, total_yoy   全期合计（NaN 视为缺失）及同比
+    """
+    cur = np.asarray(cur, dtype=float)
+    prev = np.asarray(prev, dtype=float)
+    q_cur = period_rollup(cur, quarter_size)
+    q_prev = period_rollup(prev, quarter_size)
+    total_cur = np.nansum(cur, axis=-1)
+    total_prev = np.nansum(prev, axis=-1)
+    return {
+        "yoy": yoy(cur, prev),
+        "mom": mom(cur, prev),
+        "share": share(cur),
+        "q_cur": q_cur,
+        "q_prev": q_prev,
+        "q_yoy": yoy(q_cur, q_prev),
+        "total_cur": total_cur,
+        "total_prev": total_prev,
+        "total_yoy": yoy(total_cur, total_prev),
+    }
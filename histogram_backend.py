@@ -0,0 +1,113 @@
+"""
+分箱频数后端（供图基悬挂根图等分布对比图复用）
+
+- sharded_histogram：分片并行的 np.histogram，每个分片先算箱号再 np.bincount，部分频数求和
+- grouped_histogram：多组（如上千家门店）一次 bincount 出 (n_groups, n_bins) 频数矩阵
+- streaming_histogram：按块读取数组 / np.memmap / .npy / Parquet 列，峰值内存只与块大小有关
+
+分箱规则与 np.histogram 完全一致：区间左闭右开，最后一个区间为闭区间，范围外的值忽略。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+
+# 分片并行分箱：每个分片先算好箱号再 np.bincount，各分片的部分频数最后求和
+SHARD_SIZE = 250_000
+
+def bin_indices(values, bins):
+    """
+    与 np.histogram 相同的分箱规则：区间左闭右开，最后一个区间为闭区间；
+    落在 bins 范围外（含 NaN）的值返回 -1。
+    """
+    n_bins = len(bins) - 1
+    idx = np.searchsorted(bins, values, side="right") - 1
+    idx[values == bins[-1]] = n_bins - 1
+    idx[(idx < 0) | (idx >= n_bins)] = -1
+    return idx
+
+def _bincount_shard(values, bins):
+    idx = bin_indices(values, bins)
+    return np.bincount(idx[idx >= 0], minlength=len(bins) - 1)
+
+def sharded_histogram(values, bins, workers=None, shard_size=SHARD_SIZE, executor="thread",
+                      pool=None):
+    """
+    并行版 np.histogram(values, bins)[0]，结果逐箱完全一致。
+    executor="thread" 适合内存中的大数组（searchsorted 期间释放 GIL，无需拷贝）；
+    executor="process" 用于多核报表机上的超大输入，分片会被序列化给子进程。
+    给出 pool 时直接复用这个执行器（忽略 executor），多次调用不必反复创建线程 / 进程。
+    """
+    values = np.asarray(values).reshape(-1)
+    bins = np.asarray(bins, dtype=float)
+    if workers == 1 or values.size <= shard_size:
+        return _bincount_shard(values, bins)
+
+    shards = [values[i:i + shard_size] for i in range(0, values.size, shard_size)]
+    if pool is not None:
+        parts = list(pool.map(_bincount_shard, shards, repeat(bins)))
+    else:
+        pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=workers or os.cpu_count()) as pool:
+            parts = list(pool.map(_bincount_shard, shards, repeat(bins)))
+    return np.sum(parts, axis=0)
+
+def grouped_histogram(values, groups, bins, n_groups=None):
+    """
+    一次性统计多组（如上千家门店）的分箱频数，返回 shape (n_groups, n_bins)。
+    groups 为 0..n_groups-1 的整数组号；用 组号 * n_bins + 箱号 做一次 bincount，
+    避免逐门店调用 np.histogram。
+    """
+    values = np.asarray(values).reshape(-1)
+    groups = np.asarray(groups).reshape(-1)
+    bins = np.asarray(bins, dtype=float)
+    n_bins = len(bins) - 1
+    n_groups = int(groups.max()) + 1 if n_groups is None else n_groups
+
+    idx = bin_indices(values, bins)
+    keep = idx >= 0
+    flat = groups[keep] * n_bins + idx[keep]
+    return np.bincount(flat, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+
+
+# 流式分箱：数据量远大于内存时，按块累计频数，峰值内存只与块大小有关
+CHUNK_SIZE = 1_000_000
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    把数据源统一成按块迭代的一维数组：
+    - np.ndarray / np.memmap：按 chunk_size 切片（memmap 只按需读入当前块）
+    - .npy 文件路径：以 mmap_mode="r" 打开后同上
+    - 其它可迭代对象（生成器、数据库游标分批结果等）：逐块透传
+    """
+    if isinstance(source, (str, Path)):
+        source = np.load(source, mmap_mode="r")
+    if isinstance(source, np.ndarray):
+        flat = source.reshape(-1)
+        for start in range(0, flat.size, chunk_size):
+            yield np.asarray(flat[start:start + chunk_size])
+    else:
+        for chunk in source:
+            yield np.asarray(chunk).reshape(-1)
+
+def iter_parquet_column(path, column, batch_size=CHUNK_SIZE):
+    """按批读取 Parquet 的单列（需要 pyarrow）。"""
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=[column]):
+        yield batch.column(0).to_numpy(zero_copy_only=False)
+
+def streaming_histogram(source, bins, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    逐块累计分箱频数，结果与 np.histogram 完全一致。
+    每块交给 sharded_histogram 并行统计，所有块共用同一个线程池。
+    """
+    counts = np.zeros(len(bins) - 1, dtype=np.int64)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for chunk in iter_chunks(source, chunk_size):
+            counts += sharded_histogram(chunk, bins, workers=workers, pool=pool)
+    return counts
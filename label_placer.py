@@ -0,0 +1,117 @@
+"""
+标注避让（供分面 / 小多图 / 分组折线图共用）
+
+已放置的标注框登记在像素坐标的均匀网格（空间哈希）中，查询候选位置时
+只检查候选框覆盖到的网格单元里的框：
+- 每个标注尝试固定数量的候选偏移；标注尺寸与网格单元相近、没有大量堆叠在
+  同一处时，每次查询与登记都是常数时间，整体约 O(n)
+- x、y 两个方向同时分桶，许多标注共用同一 x（如分面图各行的首尾标注）时
+  也不会退化为线性扫描；跨子图共享同一个索引
+
+用法：
+    from label_placer import LabelPlacer, offset_candidates
+
+    placer = LabelPlacer(fig)
+    placer.place(ax, x, y, "75%", offset_candidates(10, -10), ha="left", va="center")
+"""
+
+import math
+from collections import defaultdict
+
+
+def offset_candidates(dx, dy, step=8, n_steps=8, side=1):
+    """
+    候选偏移（单位 points）：先是首选位置 (dx, dy)，
+    再沿 y 方向交替上下外移（优先首选方向），最后沿 x 方向向 side 一侧外移。
+    """
+    sign = 1 if dy >= 0 else -1
+    out = [(dx, dy)]
+    for k in range(1, n_steps + 1):
+        out.append((dx, dy + sign * k * step))
+        out.append((dx, dy - sign * k * step))
+    for k in range(1, n_steps // 2 + 1):
+        out.append((dx + side * k * step, dy))
+    return out
+
+
+class LabelPlacer:
+    """
+    在像素坐标中登记已放置的标注框，并为新标注挑选第一个不重叠的候选位置。
+    box 均为 (x0, y0, x1, y1) 像素元组；cell_px 为网格单元边长，取典型标注尺寸即可。
+    """
+
+    def __init__(self, fig, pad_px=2.0, cell_px=64.0):
+        self.fig = fig
+        self.pad_px = pad_px
+        self.cell_px = cell_px
+        self._boxes = []                 # 序号 -> box
+        self._grid = defaultdict(list)   # (列, 行) -> 覆盖该单元的框序号
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def _cells(self, box):
+        c = self.cell_px
+        x0, y0, x1, y1 = box
+        for i in range(math.floor(x0 / c), math.floor(x1 / c) + 1):
+            for j in range(math.floor(y0 / c), math.floor(y1 / c) + 1):
+                yield i, j
+
+    def overlaps(self, box):
+        """box 是否与任一已登记的框相交（边界相接不算）。"""
+        x0, y0, x1, y1 = box
+        seen = set()
+        for cell in self._cells(box):
+            for k in self._grid.get(cell, ()):
+                if k in seen:
+                    continue
+                seen.add(k)
+                bx0, by0, bx1, by1 = self._boxes[k]
+                if bx1 > x0 and bx0 < x1 and by1 > y0 and by0 < y1:
+                    return True
+        return False
+
+    def add(self, box):
+        """登记一个框（也可用于预先占位，如图例、标题区域）。"""
+        k = len(self._boxes)
+        self._boxes.append(tuple(box))
+        for cell in self._cells(box):
+            self._grid[cell].append(k)
+
+    def place(self, ax, x, y, text, offsets, bounds=None, **kwargs):
+        """
+        在数据点 (x, y) 旁放置标注：依次尝试 offsets 中的偏移（points），
+        取第一个不越出 bounds（像素框，默认 ax.bbox）且不与已有标注重叠的位置；
+        都不满足时退回第一个不越界的候选（再不行就用首选位置）。
+        其余关键字参数传给 ax.annotate，返回 Annotation。
+        """
+        ann = ax.annotate(
+            text, xy=(x, y), xytext=offsets[0], textcoords="offset points", **kwargs
+        )
+        bb = ann.get_window_extent(self.fig.canvas.get_renderer())
+        p = self.pad_px
+        base = (bb.x0 - p, bb.y0 - p, bb.x1 + p, bb.y1 + p)
+        if bounds is None:
+            b = ax.bbox
+            bounds = (b.x0, b.y0, b.x1, b.y1)
+
+        pt_to_px = self.fig.dpi / 72.0
+        dx0, dy0 = offsets[0]
+        chosen = fallback = None
+        for dx, dy in offsets:
+            sx, sy = (dx - dx0) * pt_to_px, (dy - dy0) * pt_to_px
+            box = (base[0] + sx, base[1] + sy, base[2] + sx, base[3] + sy)
+            inside = (box[0] >= bounds[0] and box[2] <= bounds[2]
+                      and box[1] >= bounds[1] and box[3] <= bounds[3])
+            if not inside:
+                continue
+            if fallback is None:
+                fallback = (dx, dy, box)
+            if not self.overlaps(box):
+                chosen = (dx, dy, box)
+                break
+
+        dx, dy, box = chosen or fallback or (dx0, dy0, base)
+        ann.set_position((dx, dy))
+        self.add(box)
+        return ann
@@ -0,0 +1,272 @@
+"""
+内容寻址的渲染缓存（供定时批量出图的脚本共用）
+
+同一张图表在数据和样式都没变时，每次仍要重新作图并以 300~600 dpi 编码 PNG/SVG。
+这里以下列内容的哈希作为缓存键，命中时直接把上次编码好的文件复制到目标路径：
+- 作图函数的源码与全部参数（数组按 dtype / shape / 字节计入，函数按字节码计入），
+  以及它（经由本仓库内的辅助函数传递地）引用到的模块级常量和函数源码
+- savefig 参数与输出格式
+- 调用时已解析的 rcParams（与后端 / 交互相关的键除外）
+- matplotlib 版本
+缓存文件位于 .cache/render，总大小超过上限时按最近使用时间（mtime）淘汰。
+
+用法：
+    from render_cache import cached_savefig
+
+    def plot_xxx(values, title):
+        fig, ax = plt.subplots()
+        ...
+        return fig
+
+    fig = cached_savefig("xxx.png", plot_xxx, values, title="...",
+                         savefig_kw=dict(dpi=300, bbox_inches="tight"))
+    plt.show()
+
+命中缓存时默认仍会作图（返回 Figure，供显示或 batch_render.py 另存其他格式），
+只跳过高 dpi 的编码；调用方只需要 target 文件时可传 skip_build_on_hit=True，
+此时非交互后端（Agg 等）下完全跳过作图并返回 None。
+"""
+
+import functools
+import hashlib
+import inspect
+import io
+import os
+from pathlib import Path
+
+import numpy as np
+import matplotlib as mpl
+
+ROOT = Path(__file__).resolve().parent
+RENDER_CACHE_DIR = ROOT / ".cache" / "render"
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+# 不影响输出像素的 rcParams
+_VOLATILE_RC = ("backend", "backend_fallback", "interactive", "toolbar", "figure.raise_window")
+_NON_INTERACTIVE = {"agg", "cairo", "pdf", "pgf", "ps", "svg", "template"}
+
+
+# =========================
+# 1) 缓存键
+# =========================
+def _feed(h, obj):
+    """把 obj 的内容（而非对象身份）写入哈希；容器递归处理，字典按键排序。"""
+    if isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(f"nd{arr.dtype}{arr.shape}".encode())
+        h.update(arr.tobytes() if arr.dtype != object else repr(arr.tolist()).encode())
+    elif hasattr(obj, "to_numpy") and hasattr(obj, "index"):
+        # pandas Series / DataFrame：索引、列名与数值
+        h.update(type(obj).__name__.encode())
+        _feed(h, list(obj.index))
+        _feed(h, list(getattr(obj, "columns", [])))
+        _feed(h, obj.to_numpy())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[" if isinstance(obj, list) else b"(")
+        for item in obj:
+            _feed(h, item)
+        h.update(b"]")
+    elif isinstance(obj, functools.partial):
+        h.update(b"partial")
+        _feed(h, (obj.func, obj.args, obj.keywords))
+    elif inspect.isfunction(inspect.unwrap(getattr(obj, "__func__", obj))):
+        _feed_function(h, inspect.unwrap(getattr(obj, "__func__", obj)))
+    else:
+        text = repr(obj)
+        if " at 0x" in text:
+            # 默认 repr 含内存地址，每次运行都不同；只计入类型
+            text = f"<{type(obj).__module__}.{type(obj).__qualname__}>"
+        h.update(text.encode())
+    h.update(b"|")
+
+def _feed_code(h, code):
+    """字节码、引用的名字与常量（嵌套函数 / lambda 递归），不含行号，移动位置不影响。"""
+    h.update(code.co_code)
+    _feed(h, code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _feed_code(h, const)
+        else:
+            _feed(h, const)
+
+def _feed_function(h, fn):
+    """
+    函数（含 lambda、方法）按 模块.限定名 + 字节码 + 默认值 + 闭包取值计入，
+    不同的回调不会因默认 repr 都被归成 "function" 而得到同一个键。
+    闭包中的函数只计入限定名，避免递归闭包无限展开。
+    """
+    h.update(f"fn {fn.__module__}.{fn.__qualname__}".encode())
+    _feed_code(h, fn.__code__)
+    _feed(h, (fn.__defaults__, fn.__kwdefaults__))
+    for cell in fn.__closure__ or ():
+        try:
+            val = cell.cell_contents
+        except ValueError:  # 尚未赋值的闭包变量
+            val = None
+        _feed(h, val.__qualname__ if inspect.isfunction(val) else val)
+
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, "__qualname__", repr(obj))
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+def _is_local(obj):
+    """obj 是否定义在本仓库中（第三方库的改动由 matplotlib 版本等覆盖，不展开）。"""
+    try:
+        return Path(inspect.getsourcefile(obj)).resolve().is_relative_to(ROOT)
+    except (TypeError, ValueError):
+        return False
+
+def plot_fingerprint(plot):
+    """
+    作图函数的源码，以及它引用到的模块级名字（颜色、尺寸等常量）；
+    引用的函数 / 类计入源码，模块本身跳过。本仓库内的辅助函数（以及类的方法）
+    继续在各自模块的全局名字中展开，因此辅助函数所用常量的改动同样会改变键。
+    辅助模块中的名字以 "模块名.名字" 区分。
+    """
+    refs = {}
+    plot = inspect.unwrap(plot)
+    root_globals = getattr(plot, "__globals__", {})
+    pending, seen = [plot], set()
+    while pending:
+        fn = pending.pop()
+        if fn in seen or not hasattr(fn, "__code__"):
+            continue
+        seen.add(fn)
+        g = fn.__globals__
+        prefix = "" if g is root_globals else f"{g.get('__name__', '')}."
+        for name in sorted(_code_names(fn.__code__)):
+            if name not in g or inspect.ismodule(g[name]):
+                continue
+            val = g[name]
+            if callable(val) and hasattr(val, "__wrapped__"):
+                val = inspect.unwrap(val)
+            if inspect.isfunction(val) or inspect.isclass(val):
+                refs[prefix + name] = _source(val)
+                if _is_local(val):
+                    members = vars(val).values() if inspect.isclass(val) else (val,)
+                    pending.extend(m for m in members if inspect.isfunction(m))
+            else:
+                refs[prefix + name] = val
+    return _source(plot), refs
+
+def resolved_rcparams():
+    """当前生效的 rcParams（去掉与后端相关的键），按键排序。"""
+    return {
+        k: v for k, v in sorted(mpl.rcParams.items())
+        if k not in _VOLATILE_RC and not k.startswith("webagg.")
+    }
+
+def render_key(plot, args=(), kwargs=None, savefig_kw=None, fmt="png"):
+    """作图函数 + 参数 + savefig 参数 + rcParams + matplotlib 版本的 sha1。"""
+    h = hashlib.sha1()
+    for part in (
+        mpl.__version__, fmt, plot_fingerprint(plot),
+        args, kwargs or {}, savefig_kw or {}, resolved_rcparams(),
+    ):
+        _feed(h, part)
+    return h.hexdigest()
+
+
+# =========================
+# 2) 磁盘缓存（按 mtime 做 LRU 淘汰）
+# =========================
+class RenderCache:
+    """以 <key>.<fmt> 保存编码后的图像；读取命中会刷新 mtime。"""
+
+    def __init__(self, cache_dir=RENDER_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def path_for(self, key, fmt):
+        return self.cache_dir / f"{key}.{fmt}"
+
+    def get(self, key, fmt):
+        """命中时返回缓存文件路径并标记为最近使用，否则返回 None。"""
+        path = self.path_for(key, fmt)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, fmt, data):
+        """原子写入（先写临时文件再替换，多进程并发写同一键也安全），随后按需淘汰。"""
+        path = self.path_for(key, fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """总大小超过 max_bytes 时，从最久未使用的文件开始删除。"""
+        entries = []
+        for p in self.cache_dir.glob("*.*"):
+            if p.suffix == ".tmp":
+                continue
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+
+
+# =========================
+# 3) 对外接口
+# =========================
+def _is_interactive_backend():
+    return mpl.get_backend().lower() not in _NON_INTERACTIVE
+
+def cached_savefig(target, plot, *args, savefig_kw=None, cache=None,
+                   skip_build_on_hit=False, **kwargs):
+    """
+    fig = plot(*args, **kwargs) 并 fig.savefig(target, **savefig_kw)，结果按内容缓存。
+    输出格式取 savefig_kw["format"]，否则取 target 的扩展名。
+    返回作出的 Figure；skip_build_on_hit=True 且为非交互后端时，命中缓存不作图，返回 None。
+    """
+    target = Path(target)
+    savefig_kw = dict(savefig_kw or {})
+    fmt = savefig_kw.pop("format", None) or target.suffix.lstrip(".").lower() or "png"
+    cache = cache or RenderCache()
+
+    key = render_key(plot, args, kwargs, savefig_kw, fmt)
+    hit = cache.get(key, fmt)
+    if hit is not None:
+        target.write_bytes(hit.read_bytes())
+        if skip_build_on_hit and not _is_interactive_backend():
+            return None
+        return plot(*args, **kwargs)
+
+    fig = plot(*args, **kwargs)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **savefig_kw)
+    data = buf.getvalue()
+    cache.put(key, fmt, data)
+    target.write_bytes(data)
+    return fig
@@ -0,0 +1,350 @@
+"""
+分阶段渲染剖析（供所有图表脚本与 batch_render.py 共用）
+
+在剖析期间临时包装 matplotlib 的关键入口，把耗时按阶段（独占时间）归类：
+- data        第一个 Figure 创建之前的时间（读数、计算）
+- artists     之后未归入其他阶段的时间（创建艺术家）
+- layout      tight_layout / 布局引擎 / bbox_inches="tight" 的 get_tightbbox
+- rasterize   FigureCanvasAgg.draw（Agg 光栅化）
+- encode      PNG/JPG 等位图编码，以及 SVG/PDF 输出
+- savefig     savefig 自身的其余开销
+也可以用 phase("名称") 显式标记任意代码段。
+同时统计 canvas.draw() 调用次数、文本布局（Text._get_layout）次数、
+按类型统计新创建的艺术家，以及结束时各 Figure 中的艺术家。
+
+用法：
+    from render_profile import profile_render, profiled, phase
+
+    with profile_render("径向柱状图") as prof:
+        ...                                   # 作图 + savefig
+    prof.write_trace("trace.json")            # Chrome trace（chrome://tracing / Perfetto）
+
+    @profiled()                               # 每次调用都打印报告
+    def plot_xxx(...): ...
+
+命令行（以 __main__ 身份运行脚本，屏蔽 plt.show()）：
+    python render_profile.py 径向柱状图.py --trace trace.json --json report.json
+
+批量渲染时设置环境变量 CHART_PROFILE=1，每张图表都会在输出目录写出
+<图表>.profile.json 与 <图表>.trace.json（见 batch_render.py）。
+"""
+
+import argparse
+import functools
+import json
+import os
+import runpy
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_ENV = "CHART_PROFILE"
+PHASE_ORDER = ("data", "artists", "layout", "rasterize", "encode", "savefig")
+
+_ACTIVE = None
+
+
+def profile_enabled():
+    """环境变量 CHART_PROFILE 是否开启（空值与 "0" 视为关闭）。"""
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+# =========================
+# 1) 记录器
+# =========================
+class RenderProfile:
+    """
+    按阶段累计独占时间：每次进入 / 退出被包装的调用时，把距上一个时间点的时长
+    记到当前最内层阶段上，嵌套调用（如 savefig 内部的 draw）因此不会重复计时。
+    """
+
+    def __init__(self, name="chart"):
+        self.name = name
+        self.phase_seconds = Counter()
+        self.calls = Counter()
+        self.created = Counter()
+        self.final = Counter()
+        self.events = []          # (阶段, 开始, 时长)，秒，相对 t0
+        self.total_seconds = 0.0
+        self._stack = []          # [(阶段, 开始时间)]
+        self._figures = []
+        self._first_figure = None
+        self._t0 = self._mark = None
+
+    # -- 计时 --
+    def _base_phase(self):
+        return "data" if self._first_figure is None else "artists"
+
+    def _credit(self, now):
+        current = self._stack[-1][0] if self._stack else self._base_phase()
+        self.phase_seconds[current] += now - self._mark
+        self._mark = now
+
+    def enter(self, name):
+        now = time.perf_counter()
+        self._credit(now)
+        self._stack.append((name, now))
+
+    def exit(self):
+        now = time.perf_counter()
+        self._credit(now)
+        name, start = self._stack.pop()
+        self.events.append((name, start - self._t0, now - start))
+
+    def start(self):
+        self._t0 = self._mark = time.perf_counter()
+
+    def stop(self):
+        now = time.perf_counter()
+        self._credit(now)
+        self.total_seconds = now - self._t0
+        split = self._first_figure if self._first_figure is not None else now
+        self.events.append(("data", 0.0, split - self._t0))
+        if self._first_figure is not None:
+            self.events.append(("artists", split - self._t0, now - split))
+        for fig in self._figures:
+            self.final.update(type(a).__name__ for a in fig.findobj())
+
+    def figure_created(self, fig):
+        if self._first_figure is None:
+            self._credit(time.perf_counter())
+            self._first_figure = self._mark
+        self._figures.append(fig)
+        self.calls["figures"] += 1
+
+    # -- 输出 --
+    def report(self):
+        """结构化报告（可直接 json.dumps）。"""
+        phases = {
+            k: round(self.phase_seconds[k], 6)
+            for k in sorted(self.phase_seconds, key=_phase_rank)
+        }
+        return {
+            "name": self.name,
+            "total_seconds": round(self.total_seconds, 6),
+            "phases": phases,
+            "canvas_draw_calls": self.calls["canvas_draw"],
+            "text_layout_calls": self.calls["text_layout"],
+            "figures": self.calls["figures"],
+            "artists_created": dict(self.created.most_common()),
+            "artists_final": dict(self.final.most_common()),
+        }
+
+    def format_report(self, top=8):
+        r = self.report()
+        total = r["total_seconds"] or 1e-12
+        lines = [f"== {r['name']}：{r['total_seconds']:.3f}s"]
+        for k, sec in r["phases"].items():
+            lines.append(f"  {k:<12}{sec:9.3f}s  {100 * sec / total:5.1f}%")
+        lines.append(
+            f"  canvas.draw() {r['canvas_draw_calls']} 次，文本布局 {r['text_layout_calls']} 次，"
+            f"Figure {r['figures']} 个"
+        )
+        created = ", ".join(f"{k} {v}" for k, v in list(r["artists_created"].items())[:top])
+        final = ", ".join(f"{k} {v}" for k, v in list(r["artists_final"].items())[:top])
+        lines.append(f"  新建艺术家：{created or '—'}")
+        lines.append(f"  最终艺术家：{final or '—'}")
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """Chrome trace 事件（微秒）；阶段按时间包含关系嵌套显示。"""
+        pid = os.getpid()
+        events = [
+            {"name": name, "cat": "render", "ph": "X", "pid": pid, "tid": 0,
+             "ts": round(start * 1e6, 3), "dur": round(dur * 1e6, 3)}
+            for name, start, dur in sorted(self.events, key=lambda e: (e[1], -e[2]))
+        ]
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                       "args": {"name": self.name}})
+        return events
+
+    def write_trace(self, path):
+        data = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms",
+                "otherData": self.report()}
+        Path(path).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def write_report(self, path):
+        Path(path).write_text(json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+def _phase_rank(name):
+    return PHASE_ORDER.index(name) if name in PHASE_ORDER else len(PHASE_ORDER)
+
+
+# =========================
+# 2) 包装 matplotlib 入口
+# =========================
+def _timed(name, count=None):
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            prof = _ACTIVE
+            if prof is None:
+                return fn(*args, **kwargs)
+            if count:
+                prof.calls[count] += 1
+            prof.enter(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.exit()
+        return inner
+    return wrap
+
+def _instrument_targets():
+    """(对象, 属性名, 包装器) 列表；只在剖析期间替换。"""
+    from matplotlib import layout_engine
+    from matplotlib.artist import Artist
+    from matplotlib.figure import Figure
+    from matplotlib.text import Text
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.backends.backend_pdf import FigureCanvasPdf
+    from matplotlib.backends.backend_svg import FigureCanvasSVG
+
+    def artist_init(fn):
+        @functools.wraps(fn)
+        def inner(self, *args, **kwargs):
+            if _ACTIVE is not None:
+                _ACTIVE.created[type(self).__name__] += 1
+            return fn(self, *args, **kwargs)
+        return inner
+
+    def figure_init(fn):
+        @functools.wraps(fn)
+        def inner(self, *args, **kwargs):
+            fn(self, *args, **kwargs)
+            if _ACTIVE is not None:
+                _ACTIVE.figure_created(self)
+        return inner
+
+    def text_layout(fn):
+        @functools.wraps(fn)
+        def inner(self, *args, **kwargs):
+            if _ACTIVE is not None:
+                _ACTIVE.calls["text_layout"] += 1
+            return fn(self, *args, **kwargs)
+        return inner
+
+    return [
+        (Artist, "__init__", artist_init),
+        (Figure, "__init__", figure_init),
+        (Text, "_get_layout", text_layout),
+        (Figure, "tight_layout", _timed("layout")),
+        (Figure, "get_tightbbox", _timed("layout")),
+        (layout_engine.TightLayoutEngine, "execute", _timed("layout")),
+        (layout_engine.ConstrainedLayoutEngine, "execute", _timed("layout")),
+        (FigureCanvasAgg, "draw", _timed("rasterize", count="canvas_draw")),
+        (FigureCanvasAgg, "_print_pil", _timed("encode")),
+        (FigureCanvasSVG, "print_svg", _timed("encode")),
+        (FigureCanvasPdf, "print_pdf", _timed("encode")),
+        (Figure, "savefig", _timed("savefig")),
+    ]
+
+@contextmanager
+def _instrumented():
+    patched = []
+    try:
+        for owner, attr, wrapper in _instrument_targets():
+            # 方法可能继承自基类（如 FigureBase.get_tightbbox）：包装到 owner 上，结束时删除
+            own = owner.__dict__.get(attr)
+            setattr(owner, attr, wrapper(getattr(owner, attr)))
+            patched.append((owner, attr, own))
+        yield
+    finally:
+        for owner, attr, own in reversed(patched):
+            if own is None:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, own)
+
+
+# =========================
+# 3) 对外接口
+# =========================
+@contextmanager
+def profile_render(name="chart", report=False, trace_path=None, stream=None):
+    """
+    剖析 with 块内的作图与保存，产出 RenderProfile。
+    report=True 时结束后打印文本报告（默认输出到 stderr）；给出 trace_path 时写 Chrome trace。
+    已在剖析中时（嵌套调用）不重复计时，直接复用外层记录器。
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        yield _ACTIVE
+        return
+
+    prof = RenderProfile(name)
+    with _instrumented():
+        _ACTIVE = prof
+        prof.start()
+        try:
+            yield prof
+        finally:
+            prof.stop()
+            _ACTIVE = None
+
+    if report:
+        print(prof.format_report(), file=stream or sys.stderr)
+    if trace_path:
+        prof.write_trace(trace_path)
+
+@contextmanager
+def phase(name):
+    """显式标记一段代码所属的阶段（未在剖析中时不做任何事）。"""
+    prof = _ACTIVE
+    if prof is None:
+        yield
+        return
+    prof.enter(name)
+    try:
+        yield
+    finally:
+        prof.exit()
+
+def profiled(name=None, trace_path=None):
+    """
+    装饰器：每次调用都在 profile_render 中执行并打印报告。
+    设置了 CHART_PROFILE 环境变量时才生效，否则原样调用（零开销）。
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not profile_enabled():
+                return fn(*args, **kwargs)
+            with profile_render(name or fn.__qualname__, report=True, trace_path=trace_path):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分阶段剖析一个图表脚本")
+    parser.add_argument("script", help="图表脚本路径")
+    parser.add_argument("--trace", help="写出 Chrome trace JSON")
+    parser.add_argument("--json", help="写出结构化报告 JSON")
+    parser.add_argument("--backend", default="Agg", help="matplotlib 后端，默认 Agg")
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use(args.backend, force=True)
+    import matplotlib.pyplot as plt
+    plt.show = lambda *a, **k: None
+
+    script = Path(args.script).resolve()
+    sys.path.insert(0, str(script.parent))
+    with profile_render(script.stem.strip(), report=True, trace_path=args.trace) as prof:
+        runpy.run_path(str(script), run_name="__main__")
+        # 脚本自身没有保存时，按默认设置渲染一次，让光栅化与编码也进入统计
+        if prof.calls["canvas_draw"] == 0:
+            for n in plt.get_fignums():
+                plt.figure(n).canvas.draw()
+    if args.json:
+        prof.write_report(args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""测试直接导入仓库根目录下的公共模块（与图表脚本同级的英文名 *.py）。"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
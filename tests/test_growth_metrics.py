@@ -0,0 +1,114 @@
+"""growth_metrics：二维（主体 × 期间）输入上的同比 / 环比 / 占比 / 季度汇总。"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from growth_metrics import (
+    growth_metrics,
+    mom,
+    period_rollup,
+    prev_for_mom,
+    safe_ratio,
+    share,
+    yoy,
+)
+
+NAN = np.nan
+
+# 3 个主体 × 6 期：第 2 行含 0 基数，第 3 行含缺失
+CUR = np.array([
+    [10.0, 12.0, 15.0, 15.0, 18.0, 9.0],
+    [0.0, 5.0, 0.0, 4.0, 8.0, 2.0],
+    [7.0, NAN, 14.0, 7.0, NAN, 21.0],
+])
+PREV = np.array([
+    [8.0, 10.0, 15.0, 20.0, 12.0, 10.0],
+    [0.0, 0.0, 2.0, 0.0, 4.0, 5.0],
+    [7.0, 7.0, NAN, 14.0, 0.0, 6.0],
+])
+
+
+@pytest.fixture(autouse=True)
+def no_runtime_warnings():
+    # 除零 / NaN 运算都应被 safe_ratio 吸收，不产生 RuntimeWarning
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        yield
+
+
+def test_safe_ratio_zero_and_nan_bases():
+    np.testing.assert_array_equal(
+        safe_ratio([1.0, 1.0, NAN, 0.0, 3.0], [0.0, NAN, 2.0, 0.0, 2.0]),
+        [NAN, NAN, NAN, NAN, 1.5],
+    )
+    assert np.isnan(safe_ratio(1.0, 0.0))
+    assert safe_ratio(3, 4) == 0.75
+    assert np.ndim(safe_ratio(3, 4)) == 0
+
+
+def test_yoy_2d():
+    want = np.array([
+        [0.25, 0.2, 0.0, -0.25, 0.5, -0.1],
+        [NAN, NAN, -1.0, NAN, 1.0, -0.6],
+        [0.0, NAN, NAN, -0.5, NAN, 2.5],
+    ])
+    np.testing.assert_allclose(yoy(CUR, PREV), want)
+
+
+def test_prev_for_mom_wraps_to_previous_year_end():
+    base = prev_for_mom(CUR, PREV)
+    np.testing.assert_array_equal(base[:, 0], PREV[:, -1])
+    np.testing.assert_array_equal(base[:, 1:], CUR[:, :-1])
+
+    no_prev = prev_for_mom(CUR)
+    assert np.isnan(no_prev[:, 0]).all()
+    np.testing.assert_array_equal(no_prev[:, 1:], CUR[:, :-1])
+
+
+def test_mom_2d():
+    want = np.array([
+        [0.0, 0.2, 0.25, 0.0, 0.2, -0.5],
+        [-1.0, NAN, -1.0, NAN, 1.0, -0.75],
+        [1 / 6, NAN, NAN, -0.5, NAN, NAN],
+    ])
+    np.testing.assert_allclose(mom(CUR, PREV), want)
+    assert np.isnan(mom(CUR)[:, 0]).all()
+
+
+def test_share_ignores_missing_and_zero_totals():
+    got = share(CUR)
+    np.testing.assert_allclose(got[0], CUR[0] / 79.0)
+    np.testing.assert_allclose(got[1], CUR[1] / 19.0)
+    # 缺失值不计入合计，本身占比为 NaN
+    np.testing.assert_allclose(got[2], CUR[2] / 49.0)
+    assert np.isnan(got[2, [1, 4]]).all()
+    # 合计为 0 时占比为 NaN
+    assert np.isnan(share(np.zeros((2, 3)))).all()
+    np.testing.assert_allclose(share(CUR.T, axis=0), got.T)
+
+
+def test_period_rollup_2d():
+    values = np.array([
+        [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        [NAN, NAN, NAN, 0.0, NAN, 2.0],
+    ])
+    np.testing.assert_array_equal(period_rollup(values), [[6.0, 15.0], [NAN, 2.0]])
+    np.testing.assert_array_equal(period_rollup(values, size=2), [[3.0, 7.0, 11.0], [NAN, 0.0, 2.0]])
+    with pytest.raises(ValueError):
+        period_rollup(values, size=4)
+
+
+def test_growth_metrics_bundle():
+    m = growth_metrics(CUR, PREV)
+    np.testing.assert_allclose(m["yoy"], yoy(CUR, PREV))
+    np.testing.assert_allclose(m["mom"], mom(CUR, PREV))
+    np.testing.assert_allclose(m["share"], share(CUR))
+    assert m["q_cur"].shape == m["q_prev"].shape == (3, 2)
+    np.testing.assert_allclose(m["q_cur"], [[37.0, 42.0], [5.0, 14.0], [21.0, 28.0]])
+    np.testing.assert_allclose(m["q_prev"], [[33.0, 42.0], [2.0, 9.0], [14.0, 20.0]])
+    np.testing.assert_allclose(m["q_yoy"], [[4 / 33, 0.0], [1.5, 5 / 9], [0.5, 0.4]])
+    np.testing.assert_allclose(m["total_cur"], [79.0, 19.0, 49.0])
+    np.testing.assert_allclose(m["total_prev"], [75.0, 11.0, 34.0])
+    np.testing.assert_allclose(m["total_yoy"], [79 / 75 - 1, 19 / 11 - 1, 49 / 34 - 1])
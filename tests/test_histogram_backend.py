@@ -0,0 +1,108 @@
+"""histogram_backend 的三种分箱方式都必须与 np.histogram 逐箱一致。"""
+
+import numpy as np
+import pytest
+
+from histogram_backend import (
+    bin_indices,
+    grouped_histogram,
+    sharded_histogram,
+    streaming_histogram,
+)
+
+UNIFORM = np.linspace(-3, 3, 25)
+UNEVEN = np.array([-10.0, -1.5, -0.2, 0.0, 0.3, 1.0, 4.0, 4.5])
+
+
+def sample(n=50_000, seed=0):
+    """正态样本，混入 NaN、±inf、范围外的值，以及恰好落在箱边界上的值。"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 1.5, n)
+    values[::97] = np.nan
+    values[1::211] = np.inf
+    values[2::211] = -np.inf
+    values[3::50] = rng.uniform(-40, 40, values[3::50].size)
+    values[4::61] = rng.choice(np.r_[UNIFORM, UNEVEN], values[4::61].size)
+    return values
+
+
+def expected(values, bins):
+    return np.histogram(values, bins)[0]
+
+
+@pytest.mark.parametrize("bins", [UNIFORM, UNEVEN], ids=["uniform", "uneven"])
+def test_bin_indices_edges(bins):
+    # 区间左闭右开，最后一个区间闭合；范围外与 NaN 为 -1
+    idx = bin_indices(np.r_[bins, bins[0] - 1, bins[-1] + 1, np.nan], bins)
+    n_bins = len(bins) - 1
+    assert list(idx[:n_bins]) == list(range(n_bins))
+    assert idx[n_bins] == n_bins - 1
+    assert list(idx[-3:]) == [-1, -1, -1]
+
+
+@pytest.mark.parametrize("bins", [UNIFORM, UNEVEN], ids=["uniform", "uneven"])
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_sharded_matches_numpy(bins, executor):
+    values = sample()
+    got = sharded_histogram(values, bins, workers=3, shard_size=4_000, executor=executor)
+    np.testing.assert_array_equal(got, expected(values, bins))
+
+
+def test_sharded_single_shard_and_integers():
+    values = np.arange(-5, 30)
+    bins = np.arange(0, 21, 4)
+    np.testing.assert_array_equal(sharded_histogram(values, bins), np.histogram(values, bins)[0])
+
+
+@pytest.mark.parametrize("bins", [UNIFORM, UNEVEN], ids=["uniform", "uneven"])
+def test_grouped_matches_numpy_per_group(bins):
+    values = sample(20_000, seed=1)
+    groups = np.random.default_rng(2).integers(0, 7, values.size)
+    got = grouped_histogram(values, groups, bins, n_groups=9)
+    assert got.shape == (9, len(bins) - 1)
+    for g in range(9):
+        np.testing.assert_array_equal(got[g], expected(values[groups == g], bins))
+
+
+@pytest.mark.parametrize("chunk_size", [1_000, 7_777, 10 ** 6])
+def test_streaming_matches_numpy(chunk_size):
+    values = sample(30_000, seed=3)
+    got = streaming_histogram(values, UNEVEN, chunk_size=chunk_size, workers=2)
+    np.testing.assert_array_equal(got, expected(values, UNEVEN))
+
+
+def test_streaming_memmap_and_npy(tmp_path):
+    values = sample(40_000, seed=4).reshape(200, 200)
+    path = tmp_path / "values.npy"
+    np.save(path, values)
+    want = expected(values.ravel(), UNIFORM)
+
+    mm = np.load(path, mmap_mode="r")
+    assert isinstance(mm, np.memmap)
+    np.testing.assert_array_equal(streaming_histogram(mm, UNIFORM, chunk_size=5_000), want)
+    np.testing.assert_array_equal(streaming_histogram(path, UNIFORM, chunk_size=5_000), want)
+    np.testing.assert_array_equal(streaming_histogram(str(path), UNIFORM, chunk_size=5_000), want)
+
+
+def test_streaming_generator_source():
+    values = sample(12_000, seed=5)
+    chunks = (values[i:i + 2_500] for i in range(0, values.size, 2_500))
+    np.testing.assert_array_equal(streaming_histogram(chunks, UNIFORM), expected(values, UNIFORM))
+
+
+def test_streaming_reuses_one_pool(monkeypatch):
+    import histogram_backend
+
+    created = []
+    real = histogram_backend.ThreadPoolExecutor
+
+    def counting_pool(*args, **kwargs):
+        created.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(histogram_backend, "ThreadPoolExecutor", counting_pool)
+    # 每块都大于 SHARD_SIZE，会被切片并行统计
+    values = sample(3 * histogram_backend.SHARD_SIZE + 1_000, seed=6)
+    got = streaming_histogram(values, UNIFORM, chunk_size=2 * histogram_backend.SHARD_SIZE, workers=2)
+    np.testing.assert_array_equal(got, expected(values, UNIFORM))
+    assert len(created) == 1
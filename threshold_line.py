@@ -0,0 +1,62 @@
+"""
+阈值着色折线（供趋势类图表共用）
+
+把曲线在与阈值（基准线）的交点处精确切开（线性插值求交点），
+阈值以上 / 以下分别着色，整条曲线只生成一个 LineCollection：
+- 艺术家数量恒为 1，与采样密度无关
+- 同色的连续片段合并为一条折线，SVG 中每段只对应一条 path
+
+用法：
+    from threshold_line import threshold_line
+
+    threshold_line(ax, xs, ys, threshold=0, above="#00A95C", below="#C85A5A", linewidth=3)
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+def split_at_threshold(x, y, threshold=0.0):
+    """
+    在相邻两点跨越阈值的位置插入交点（y == threshold）。
+    返回 (x, y, above)：插入交点后的坐标，以及每个相邻点对所在片段是否位于阈值以上。
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    d = y - threshold
+
+    cross = np.flatnonzero(d[:-1] * d[1:] < 0)
+    t = d[cross] / (d[cross] - d[cross + 1])
+    xc = x[cross] + (x[cross + 1] - x[cross]) * t
+
+    x = np.insert(x, cross + 1, xc)
+    y = np.insert(y, cross + 1, threshold)
+    above = (y[:-1] + y[1:]) / 2.0 >= threshold
+    return x, y, above
+
+def threshold_runs(x, y, threshold=0.0):
+    """
+    把曲线切成同色连续片段，返回 (runs, above)：
+    runs 为各片段的 (k, 2) 顶点数组（相邻片段共享交点），above 为各片段是否在阈值以上。
+    """
+    x, y, above = split_at_threshold(x, y, threshold)
+    if above.size == 0:
+        return [], above
+
+    pts = np.column_stack([x, y])
+    starts = np.r_[0, np.flatnonzero(above[1:] != above[:-1]) + 1]
+    ends = np.r_[starts[1:], above.size]
+    runs = [pts[a:b + 1] for a, b in zip(starts, ends)]
+    return runs, above[starts]
+
+def threshold_line(ax, x, y, threshold=0.0, above="#00A95C", below="#C85A5A", **kwargs):
+    """
+    在 ax 上绘制阈值着色曲线，返回 LineCollection；
+    其余关键字参数（linewidth、zorder 等）传给 LineCollection。
+    """
+    runs, run_above = threshold_runs(x, y, threshold)
+    kwargs.setdefault("capstyle", "butt")
+    kwargs.setdefault("joinstyle", "round")
+    coll = LineCollection(runs, colors=[above if a else below for a in run_above], **kwargs)
+    ax.add_collection(coll)
+    return coll
@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
 
+from growth_metrics import growth_metrics
+
 # =========================
 # 0) 虚拟数据（12个月，单位：万元）
 # =========================
@@ -14,7 +16,7 @@ fy24 = np.array([419, 606, 538, 585, 869, 508, 560, 620, 590, 640, 710, 780], dt
 yoy_rate = np.array([-0.09, -0.32, -0.40, -0.09, -0.29, 0.34, 0.08, -0.12, 0.05, 0.18, -0.06, 0.10], dtype=float)
 fy25 = np.round(fy24 * (1 + yoy_rate), 1)
 
-yoy = fy25 / fy24 - 1
+yoy = growth_metrics(fy25, fy24)["yoy"]
 
 # =========================
 # 1) 样式
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from label_placer import LabelPlacer, offset_candidates
+from render_cache import cached_savefig
+
 plt.rcParams["font.sans-serif"] = [
     "Microsoft YaHei",
     "SimHei",
@@ -10,8 +13,6 @@ plt.rcParams["font.sans-serif"] = [
 
 plt.rcParams["axes.unicode_minus"] = False
 
-products = ["产品A", "产品B", "产品C", "产品D"]
-
 quarters = ["Q1", "Q2", "Q3", "Q4"]
 
 data = {
@@ -26,193 +27,219 @@ highlight_product = "产品A"
 highlight_color = "#FE762C"
 normal_color = "#504B49"
 
-x_positions = []
-x_labels = []
 
-for i, product in enumerate(products):
+def plot_stage_lines(data, quarters, highlight_product):
+    """按产品分组的季度折线，高亮 highlight_product，返回 Figure。"""
+    products = list(data)
+    n_q = len(quarters)
+    group_w = n_q + 1  # 每个产品占 n_q 个季度位，组间留 1 个空位
 
-    for j, q in enumerate(quarters):
+    x_positions = []
+    x_labels = []
 
-        x_positions.append(i * 5 + j)
-        x_labels.append(q)
+    for i, product in enumerate(products):
 
-x_positions = np.array(x_positions)
+        for j, q in enumerate(quarters):
 
-fig, ax = plt.subplots(figsize=(12, 7), dpi=150)
+            x_positions.append(i * group_w + j)
+            x_labels.append(q)
 
-for i, product in enumerate(products):
+    x_positions = np.array(x_positions)
 
-    start = i * 5 - 0.5
-    end = i * 5 + 3.5
+    fig, ax = plt.subplots(figsize=(12, 7), dpi=150)
 
-    if product == highlight_product:
+    ax.set_xlim(-0.8, (len(products) - 1) * group_w + n_q - 1 + 0.8)
+    ax.set_ylim(0, 105)
 
-        ax.axvspan(
-            start,
-            end,
-            color=highlight_color,
-            alpha=0.08,
-            zorder=0
-        )
+    # 数值标注先收集，布局完成后统一交给 placer（见函数末尾）
+    labels = []
 
-    else:
+    for i, product in enumerate(products):
 
-        ax.axvspan(
-            start,
-            end,
-            color="#F5F5F5",
-            alpha=1,
-            zorder=0
-        )
+        start = i * group_w - 0.5
+        end = i * group_w + n_q - 0.5
 
-for i, product in enumerate(products):
-
-    y = data[product]
-
-    x = np.array([
-        i * 5 + j
-        for j in range(4)
-    ])
-
-    if product == highlight_product:
-
-        color = highlight_color
-        lw = 3.2
-        alpha = 1
-        zorder = 5
-        fontweight = "bold"
-
-    else:
-
-        color = normal_color
-        lw = 2.2
-        alpha = 0.5
-        zorder = 3
-        fontweight = "normal"
-
-    ax.plot(
-        x,
-        y,
-        color=color,
-        linewidth=lw,
-        alpha=alpha,
-        marker="o",
-        markersize=8,
-        markerfacecolor="white",
-        markeredgecolor=color,
-        markeredgewidth=2,
-        label=product,
-        zorder=zorder
-    )
+        if product == highlight_product:
 
-    for xi, yi in zip(x, y):
+            ax.axvspan(
+                start,
+                end,
+                color=highlight_color,
+                alpha=0.08,
+                zorder=0
+            )
 
-        if yi >= 85:
-            offset = -8
-            va = "top"
-        elif yi <= 15:
-            offset = 8
-            va = "bottom"
         else:
-            offset = 7
-            va = "bottom"
 
-        ax.text(
-            xi,
-            yi + offset,
-            f"{yi}%",
-            ha="center",
-            va=va,
-            fontsize=10,
-            color=color,
-            fontweight=fontweight,
-            zorder=10,
-            bbox=dict(
-                facecolor="white",
-                edgecolor="none",
-                alpha=0.9,
-                boxstyle="round,pad=0.18"
+            ax.axvspan(
+                start,
+                end,
+                color="#F5F5F5",
+                alpha=1,
+                zorder=0
             )
+
+    for i, product in enumerate(products):
+
+        y = data[product]
+
+        x = np.array([
+            i * group_w + j
+            for j in range(n_q)
+        ])
+
+        if product == highlight_product:
+
+            color = highlight_color
+            lw = 3.2
+            alpha = 1
+            zorder = 5
+            fontweight = "bold"
+
+        else:
+
+            color = normal_color
+            lw = 2.2
+            alpha = 0.5
+            zorder = 3
+            fontweight = "normal"
+
+        ax.plot(
+            x,
+            y,
+            color=color,
+            linewidth=lw,
+            alpha=alpha,
+            marker="o",
+            markersize=8,
+            markerfacecolor="white",
+            markeredgecolor=color,
+            markeredgewidth=2,
+            label=product,
+            zorder=zorder
         )
 
-ax.set_title(
-    "产品销量目标达成率",
-    loc="left",
-    fontsize=20,
-    fontweight="bold",
-    pad=34
-)
+        for xi, yi in zip(x, y):
+
+            if yi >= 85:
+                offset = -8
+                va = "top"
+            elif yi <= 15:
+                offset = 8
+                va = "bottom"
+            else:
+                offset = 7
+                va = "bottom"
+
+            labels.append((xi, yi + offset, f"{yi}%", va, color, fontweight))
+
+    ax.set_title(
+        "产品销量目标达成率",
+        loc="left",
+        fontsize=20,
+        fontweight="bold",
+        pad=34
+    )
 
-legend = ax.legend(
-    loc="upper left",
-    bbox_to_anchor=(0, 1.04),
-    frameon=False,
-    ncol=4,
-    fontsize=10,
-    handlelength=2.2,
-    handleheight=1,
-    columnspacing=1.6,
-    borderaxespad=0
-)
+    legend = ax.legend(
+        loc="upper left",
+        bbox_to_anchor=(0, 1.04),
+        frameon=False,
+        ncol=4,
+        fontsize=10,
+        handlelength=2.2,
+        handleheight=1,
+        columnspacing=1.6,
+        borderaxespad=0
+    )
 
-legend._legend_box.align = "left"
+    legend._legend_box.align = "left"
 
-ax.set_xticks(x_positions)
+    ax.set_xticks(x_positions)
 
-ax.set_xticklabels(
-    x_labels,
-    fontsize=10
-)
+    ax.set_xticklabels(
+        x_labels,
+        fontsize=10
+    )
 
-ax.set_xlim(-0.8, 18.8)
+    ax.set_yticks(np.arange(0, 101, 10))
 
-ax.set_ylim(0, 105)
+    ax.set_yticklabels(
+        [f"{i}%" for i in range(0, 101, 10)],
+        fontsize=10
+    )
 
-ax.set_yticks(np.arange(0, 101, 10))
+    ax.grid(
+        axis="y",
+        linestyle="--",
+        linewidth=0.8,
+        alpha=0.25
+    )
 
-ax.set_yticklabels(
-    [f"{i}%" for i in range(0, 101, 10)],
-    fontsize=10
-)
+    ax.grid(
+        axis="x",
+        visible=False
+    )
 
-ax.grid(
-    axis="y",
-    linestyle="--",
-    linewidth=0.8,
-    alpha=0.25
-)
+    ax.tick_params(
+        axis="x",
+        length=0
+    )
 
-ax.grid(
-    axis="x",
-    visible=False
-)
+    ax.tick_params(
+        axis="y",
+        length=0
+    )
 
-ax.tick_params(
-    axis="x",
-    length=0
-)
+    for spine in ["top", "right"]:
 
-ax.tick_params(
-    axis="y",
-    length=0
-)
+        ax.spines[spine].set_visible(False)
+
+    ax.spines["left"].set_color("#DDDDDD")
+    ax.spines["bottom"].set_color("#DDDDDD")
+
+    fig.patch.set_facecolor("white")
+    ax.set_facecolor("white")
 
-for spine in ["top", "right"]:
+    fig.tight_layout()
 
-    ax.spines[spine].set_visible(False)
+    # placer 按像素判断碰撞，必须在 tight_layout 确定坐标轴位置之后再放置，
+    # 长序列时自动在 x / y 方向错开
+    placer = LabelPlacer(fig)
 
-ax.spines["left"].set_color("#DDDDDD")
-ax.spines["bottom"].set_color("#DDDDDD")
+    for xi, yi, text, va, color, fontweight in labels:
+
+        placer.place(
+            ax,
+            xi,
+            yi,
+            text,
+            offset_candidates(0, 0, step=6, side=1),
+            ha="center",
+            va=va,
+            fontsize=10,
+            color=color,
+            fontweight=fontweight,
+            zorder=10,
+            bbox=dict(
+                facecolor="white",
+                edgecolor="none",
+                alpha=0.9,
+                boxstyle="round,pad=0.18"
+            )
+        )
 
-fig.patch.set_facecolor("white")
-ax.set_facecolor("white")
+    return fig
 
-plt.tight_layout()
 
-plt.savefig(
+# 数据与样式不变时直接复用上次编码好的 PNG（见 render_cache.py）
+fig = cached_savefig(
     "产品销量目标达成率.png",
-    dpi=300,
-    bbox_inches="tight"
+    plot_stage_lines,
+    data,
+    quarters,
+    highlight_product,
+    savefig_kw=dict(dpi=300, bbox_inches="tight")
 )
 
 plt.show()
@@ -2,6 +2,9 @@
 import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from label_placer import LabelPlacer, offset_candidates
 
 
 mpl.rcParams["axes.unicode_minus"] = False
@@ -26,37 +29,24 @@ line_color  = "#FE762C"
 sep_color   = "#D9D9D9"
 label_color = "#504B49"
 
-categories = list(data.keys())
-n = len(categories)
-
-fig_h = 1.15 * n + 1.2
-fig, axes = plt.subplots(
-    nrows=n, ncols=1, figsize=(10.5, fig_h), sharex=True,
-    gridspec_kw={"hspace": 0.30, "top": 0.88, "bottom": 0.16, "left": 0.20, "right": 0.95}
-)
-if n == 1:
-    axes = [axes]
-
-x_min, x_max = years.min(), years.max()
-x_pad = 0.45
-xlim = (x_min - x_pad, x_max + x_pad)
-
-cat_x = xlim[0] - 1
+PANEL_GAP = 0.30   # 分面间距（相对分面高度，对应原 gridspec 的 hspace）
 
 
 def smart_annotate(ax, x, y, text, *,
+                   placer,
+                   band,
                    side="right",
                    slope=None,
                    fontsize=12,
                    bold=False,
                    color=line_color,
-                   occupied=None,      
-                   min_sep_pt=14):     
-
-    if occupied is None:
-        occupied = []
-
-    ymin, ymax = ax.get_ylim()
+                   step_pt=10):
+    """
+    首选偏移由斜率决定（上升段标在点下方、下降段标在上方，贴近分面上下边界时翻转）；
+    与已放置的标注重叠时，由 placer 沿 y、再沿 x 方向外移。
+    band: 该分面在坐标轴中的 (下沿, 上沿)。
+    """
+    ymin, ymax = band
     yr = ymax - ymin if ymax > ymin else 1.0
 
     dx = 10 if side == "right" else -10
@@ -71,40 +61,14 @@ def smart_annotate(ax, x, y, text, *,
     if (y < ymin + 0.12 * yr) and (dy < 0):
         dy = abs(dy)
 
-
-    pt_to_px = ax.figure.dpi / 72.0
-    min_sep_px = min_sep_pt * pt_to_px
-
-    x_disp, y_disp = ax.transData.transform((x, y))
-    y_target = y_disp + dy * pt_to_px
-
-    step_pt = 10
-    max_iter = 30
-    sign = 1 if dy >= 0 else -1  
-
-    def too_close(y_px):
-        return any(abs(y_px - yy) < min_sep_px for yy in occupied)
-
-    it = 0
-    while too_close(y_target) and it < max_iter:
-        dy += sign * step_pt
-        y_target = y_disp + dy * pt_to_px
-
-        if y_target > ax.bbox.y1 - 6 * pt_to_px or y_target < ax.bbox.y0 + 6 * pt_to_px:
-            sign *= -1
-            dy += sign * step_pt
-            y_target = y_disp + dy * pt_to_px
-
-        it += 1
-
-    occupied.append(y_target)
+    # 标注可伸出本分面（分面很矮），只要求留在画布内；跨分面的碰撞由同一个 placer 检查
+    bounds = tuple(ax.figure.bbox.extents)
 
     weight = "bold" if bold else "normal"
-    ax.annotate(
-        text,
-        xy=(x, y),
-        xytext=(dx, dy),
-        textcoords="offset points",
+    return placer.place(
+        ax, x, y, text,
+        offset_candidates(dx, dy, step=step_pt, side=1 if side == "right" else -1),
+        bounds=bounds,
         ha="left" if side == "right" else "right",
         va="center",
         fontsize=fontsize,
@@ -115,83 +79,133 @@ def smart_annotate(ax, x, y, text, *,
     )
 
 
-
-for ax, cat in zip(axes, categories):
-    y = np.array(data[cat], dtype=float)
-
-    ax.plot(
-        years, y, color=line_color, linewidth=3.0,
-        solid_capstyle="round", zorder=2
-    )
-
-    ax.scatter([years[-1]], [y[-1]], s=140, color=line_color, zorder=3)
-    ax.scatter([years[0]],  [y[0]],  s=40,  color=line_color, zorder=3)
-
-    y_min, y_max = y.min(), y.max()
-    pad = max(6, 0.22 * (y_max - y_min + 1e-9))
-    ax.set_ylim(y_min - pad, y_max + pad)
+# =========================
+# 分面引擎：所有分面画在同一个 Axes 中
+# =========================
+def facet_layout(values, gap=PANEL_GAP):
+    """
+    values: (n, T)。每个分面按自身范围加留白缩放到高度 1 的条带，自上而下排列。
+    返回 (y_scaled, bottoms)：缩放并平移后的 (n, T) 坐标，以及各分面条带的下沿。
+    """
+    y_min = values.min(axis=1, keepdims=True)
+    y_max = values.max(axis=1, keepdims=True)
+    pad = np.maximum(6, 0.22 * (y_max - y_min + 1e-9))
+    lo, hi = y_min - pad, y_max + pad
+
+    n = values.shape[0]
+    bottoms = (n - 1 - np.arange(n)) * (1 + gap)
+    return (values - lo) / (hi - lo) + bottoms[:, None], bottoms
+
+def draw_facets(categories, values, years):
+    """把 categories 对应的 values 行画成一张分面图，返回 fig。"""
+    n = len(categories)
+    fig_h = 1.15 * n + 1.2
+    fig = plt.figure(figsize=(10.5, fig_h))
+    ax = fig.add_axes([0.20, 0.16, 0.75, 0.72])
+
+    x_min, x_max = years.min(), years.max()
+    x_pad = 0.45
+    xlim = (x_min - x_pad, x_max + x_pad)
+    cat_x = xlim[0] - 1
+
+    ys, bottoms = facet_layout(values)
+    ax.set_xlim(*xlim)
+    ax.set_ylim(0, bottoms[0] + 1)
+
+    segments = np.stack([np.broadcast_to(years, ys.shape), ys], axis=-1)
+    ax.add_collection(LineCollection(
+        segments, colors=line_color, linewidths=3.0,
+        capstyle="round", joinstyle="round", zorder=2
+    ))
+    ax.scatter(np.full(n, years[-1]), ys[:, -1], s=140, color=line_color, zorder=3)
+    ax.scatter(np.full(n, years[0]),  ys[:, 0],  s=40,  color=line_color, zorder=3)
+
+    # 原先每个分面的 axhline 落在坐标轴下沿、被裁掉一半，这里用一半线宽保持观感
+    ax.add_collection(LineCollection(
+        [[(xlim[0], b), (xlim[1], b)] for b in bottoms],
+        colors=sep_color, linewidths=1.0, zorder=1
+    ))
 
     ax.set_yticks([])
     for spine in ax.spines.values():
         spine.set_visible(False)
 
-    ax.axhline(ax.get_ylim()[0], color=sep_color, linewidth=2.0, zorder=1)
-
-    ax.text(
-        cat_x, np.mean(ax.get_ylim()), cat,
-        ha="left", va="center", fontsize=20, color=label_color
-    )
+    ax.xaxis.set_ticks_position("top")
+    ax.xaxis.set_label_position("top")
+    ax.set_xticks(years)
+    ax.set_xticklabels([str(y) for y in years], fontsize=12, color="#666666")
+    ax.tick_params(axis="x", length=0, pad=10)
 
-    slope_start = (y[1] - y[0]) / (years[1] - years[0]) if len(y) >= 2 else 0
-    slope_end   = (y[-1] - y[-2]) / (years[-1] - years[-2]) if len(y) >= 2 else 0
-
-    smart_annotate(
-        ax, years[0], y[0], f"{int(round(y[0]))}%",
-        side="right", slope=slope_start,
-        fontsize=12, bold=False
+    if len(years) >= 2:
+        slope_start = (values[:, 1] - values[:, 0]) / (years[1] - years[0])
+        slope_end   = (values[:, -1] - values[:, -2]) / (years[-1] - years[-2])
+    else:
+        slope_start = slope_end = np.zeros(n)
+
+    placer = LabelPlacer(fig)
+    for i, cat in enumerate(categories):
+        band = (bottoms[i], bottoms[i] + 1)
+        ax.text(
+            cat_x, bottoms[i] + 0.5, cat,
+            ha="left", va="center", fontsize=20, color=label_color
+        )
+
+        smart_annotate(
+            ax, years[0], ys[i, 0], f"{int(round(values[i, 0]))}%",
+            placer=placer, band=band,
+            side="right", slope=slope_start[i],
+            fontsize=12, bold=False
+        )
+
+        smart_annotate(
+            ax, years[-1], ys[i, -1], f"{int(round(values[i, -1]))}%",
+            placer=placer, band=band,
+            side="right", slope=slope_end[i],
+            fontsize=16, bold=True
+        )
+
+    fig.add_artist(plt.Line2D(
+        [0.07, 0.95], [0.88, 0.88],
+        transform=fig.transFigure, color=sep_color, linewidth=2.0
+    ))
+
+    bbox_kw = dict(facecolor="white", edgecolor="none", pad=2.5)
+
+    fig.text(
+        0.07, 0.895, "% 的资助者",
+        ha="left", va="center", fontsize=12, color=line_color,
+        transform=fig.transFigure, bbox=bbox_kw
     )
 
-    smart_annotate(
-        ax, years[-1], y[-1], f"{int(round(y[-1]))}%",
-        side="right", slope=slope_end,
-        fontsize=16, bold=True
+    foot = "百分比可理解为“选择该领域的受访者占比”。"
+    fig.text(
+        0.065, 0.07, foot,
+        ha="left", va="center", fontsize=10, color="#777777",
+        transform=fig.transFigure, bbox=bbox_kw
     )
-
-    ax.set_xlim(*xlim)
-
-
-axes[0].xaxis.set_ticks_position("top")
-axes[0].xaxis.set_label_position("top")
-axes[0].set_xticks(years)
-axes[0].set_xticklabels([str(y) for y in years], fontsize=12, color="#666666")
-axes[0].tick_params(axis="x", length=0, pad=10)
-
-for ax in axes[1:]:
-    ax.tick_params(axis="x", which="both",
-                   bottom=False, top=False,
-                   labelbottom=False, labeltop=False)
-
-fig.add_artist(plt.Line2D(
-    [0.07, 0.95], [0.88, 0.88],
-    transform=fig.transFigure, color=sep_color, linewidth=2.0
-))
-
-
-bbox_kw = dict(facecolor="white", edgecolor="none", pad=2.5)
-
-fig.text(
-    0.07, 0.895, "% 的资助者",
-    ha="left", va="center", fontsize=12, color=line_color,
-    transform=fig.transFigure, bbox=bbox_kw
-)
-
-foot = "百分比可理解为“选择该领域的受访者占比”。"
-fig.text(
-    0.065, 0.07, foot,
-    ha="left", va="center", fontsize=10, color="#777777",
-    transform=fig.transFigure, bbox=bbox_kw
-)
+    return fig
+
+def facet_pages(data, years, per_page=None):
+    """
+    按每页 per_page 个分面逐页生成图形（生成器）；per_page=None 时全部放在一页。
+    取下一页（或生成器关闭）时关闭上一页的图形，pyplot 中始终只保留一页；
+    每页需在循环体内保存完毕。
+    """
+    categories = list(data.keys())
+    values = np.array([data[c] for c in categories], dtype=float)
+    per_page = per_page or len(categories)
+    for i in range(0, len(categories), per_page):
+        fig = draw_facets(categories[i:i + per_page], values[i:i + per_page], years)
+        try:
+            yield fig
+        finally:
+            plt.close(fig)
+
+
+# 样例数据一页即可放下；类别很多时用 facet_pages 逐页保存（见下方注释）
+fig = draw_facets(list(data), np.array(list(data.values()), dtype=float), years)
 
 plt.show()
 
-# fig.savefig("figure_pull_lines_apart_cn.png", dpi=200, bbox_inches="tight")
+# for i, fig in enumerate(facet_pages(data, years, per_page=12), start=1):
+#     fig.savefig(f"figure_pull_lines_apart_cn_{i:02d}.png", dpi=200, bbox_inches="tight")
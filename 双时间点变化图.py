@@ -1,34 +1,21 @@
 # -*- coding: utf-8 -*-
 import matplotlib.pyplot as plt
 
-def set_chinese_font():
-    """
-    """
-    candidates = [
-        "Microsoft YaHei", "SimHei", "SimSun",          # Windows
-        "PingFang SC", "Heiti SC", "Songti SC",         # macOS
-        "Noto Sans CJK SC", "WenQuanYi Micro Hei",      # Linux
-        "Arial Unicode MS"
-    ]
-    available = {f.name for f in plt.matplotlib.font_manager.fontManager.ttflist}
-    for f in candidates:
-        if f in available:
-            plt.rcParams["font.sans-serif"] = [f]
-            break
-    plt.rcParams["axes.unicode_minus"] = False
-
-def slopegraph_employee_feedback(show_delta=False):
-    set_chinese_font()
-
-    items = [
-        ("同事关系",   85, 91, False),
-        ("企业文化",   80, 96, False),
-        ("工作环境",   76, 75, False),
-        ("领导力",     59, 62, False),
-        ("职业发展",   49, 33, True),   
-        ("奖励与认可", 41, 45, False),
-        ("绩效管理",   33, 42, False),
-    ]
+from cjk_font import use_cjk_font
+
+FEEDBACK_ITEMS = [
+    ("同事关系",   85, 91, False),
+    ("企业文化",   80, 96, False),
+    ("工作环境",   76, 75, False),
+    ("领导力",     59, 62, False),
+    ("职业发展",   49, 33, True),   
+    ("奖励与认可", 41, 45, False),
+    ("绩效管理",   33, 42, False),
+]
+
+def slopegraph_employee_feedback(show_delta=False, items=FEEDBACK_ITEMS):
+    """items: (维度名, 2014 好评占比, 2015 好评占比, 是否高亮) 列表。"""
+    use_cjk_font()
 
     fig, ax = plt.subplots(figsize=(9.2, 6.6), dpi=160)
 
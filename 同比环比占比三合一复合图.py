@@ -2,34 +2,16 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 from matplotlib.patches import Patch
-from matplotlib import font_manager
 from pathlib import Path
 
+from cjk_font import use_cjk_font
+from threshold_line import threshold_line
+from growth_metrics import growth_metrics
+
 # =========================
-# 0) 中文字体：尽量自动找可用字体
+# 0) 中文字体：共享解析结果（见 cjk_font.py）
 # =========================
-def pick_chinese_font():
-    """
-    尝试在本机寻找可显示中文的字体。
-    Windows 通常有 Microsoft YaHei / SimHei；
-    macOS 常见 PingFang SC；
-    Linux 可装 Noto Sans CJK。
-    """
-    candidates = [
-        "Microsoft YaHei", "SimHei",
-        "PingFang SC", "Heiti SC", "Songti SC",
-        "Noto Sans CJK SC", "Source Han Sans SC",
-        "Arial Unicode MS",
-    ]
-    for f in candidates:
-        try:
-            font_manager.findfont(f, fallback_to_default=False)
-            return f
-        except Exception:
-            pass
-    return None
-
-font_name = pick_chinese_font()
+font_name = use_cjk_font()
 if font_name:
     plt.rcParams["font.sans-serif"] = [font_name]
 else:
@@ -54,16 +36,17 @@ rev_2025 = np.array([472,272,327,418,234,471,294,246,458,383,413,259], dtype=flo
 # =========================
 # 2) 指标计算：同比 / 环比 / 占比
 # =========================
+metrics = growth_metrics(rev_2025, rev_2024)
+
 # 同比（YoY）：2025当月 vs 2024同月
-yoy = (rev_2025 / rev_2024 - 1.0) * 100.0
+yoy = metrics["yoy"] * 100.0
 
 # 环比（MoM）：2025当月 vs 上月
 # 这里让 1月 用“上年12月(2024年12月)”做上月基数（常见业务口径）
-prev_for_mom = np.r_[rev_2024[-1], rev_2025[:-1]]
-mom = (rev_2025 / prev_for_mom - 1.0) * 100.0
+mom = metrics["mom"] * 100.0
 
 # 占比：2025每月占2025全年比例
-share = rev_2025 / rev_2025.sum() * 100.0
+share = metrics["share"] * 100.0
 share_round = np.rint(share).astype(int)
 
 
@@ -116,8 +99,7 @@ ax_bar = fig.add_subplot(gs[2], sharex=ax_mom)
 ax_mom.axhline(0, color=C_GRID, linestyle="--", linewidth=1.2, alpha=0.9)
 
 xs, ys = smooth_curve(x, mom, n=420, window=35)
-ax_mom.plot(xs, np.where(ys >= 0, ys, np.nan), color=C_POS, linewidth=4)
-ax_mom.plot(xs, np.where(ys <  0, ys, np.nan), color=C_NEG, linewidth=4)
+threshold_line(ax_mom, xs, ys, threshold=0, above=C_POS, below=C_NEG, linewidths=4)
 
 mom_colors = np.where(mom >= 0, C_POS, C_NEG)
 ax_mom.scatter(x, mom, s=46, color=mom_colors, zorder=4)
@@ -30,6 +30,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from histogram_backend import streaming_histogram
+
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS"]
 plt.rcParams["axes.unicode_minus"] = False
 
@@ -45,19 +47,24 @@ current_sales = np.concatenate([
 current_sales = current_sales[(current_sales >= 70) & (current_sales <= 90)]
 
 
+def root_scale(obs_counts, base_counts):
+    """Baseline 频数按样本量缩放为期望频数，返回 (√Observed, √Expected)。"""
+    expected_counts = base_counts / base_counts.sum() * obs_counts.sum()
+    expected_counts = np.clip(expected_counts, 1e-9, None)
+    return np.sqrt(obs_counts), np.sqrt(expected_counts)
+
+
 bins = np.arange(70, 91, 2)
 bin_centers = (bins[:-1] + bins[1:]) / 2
 bin_width = np.diff(bins)
 
-obs_counts, _ = np.histogram(current_sales, bins=bins)
-base_counts, _ = np.histogram(baseline_sales, bins=bins)
-
-expected_counts = base_counts / base_counts.sum() * obs_counts.sum()
-expected_counts = np.clip(expected_counts, 1e-9, None)
+# 这里是内存数组；换成 np.load("baseline.npy", mmap_mode="r")、
+# histogram_backend.iter_parquet_column("orders.parquet", "amount") 等数据源即可流式统计
+obs_counts = streaming_histogram(current_sales, bins)
+base_counts = streaming_histogram(baseline_sales, bins)
 
 # Root scale
-sqrt_obs = np.sqrt(obs_counts)
-sqrt_exp = np.sqrt(expected_counts)
+sqrt_obs, sqrt_exp = root_scale(obs_counts, base_counts)
 
 
 bar_bottom = np.minimum(sqrt_exp, sqrt_obs)
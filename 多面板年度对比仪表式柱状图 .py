@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 
+from growth_metrics import growth_metrics, yoy
+
 
 UNIT = "万元"
 months_cn = ["1月","2月","3月","4月","5月","6月","7月","8月","9月","10月","11月","12月"]
@@ -12,22 +14,15 @@ monthly_2025 = np.array([735, 518, 458, 614, 470, 721, 782, 375, 889, 825, 448,
 total_2024 = 7144
 total_2025 = 7428
 
-q_idx = [(0,3), (3,6), (6,9), (9,12)]
 q_labels = ["Q1","Q2","Q3","Q4"]
-q_2024 = np.array([monthly_2024[a:b].sum() for a,b in q_idx], dtype=float)
-q_2025 = np.array([monthly_2025[a:b].sum() for a,b in q_idx], dtype=float)
-
-def yoy(new, old):
-    old = np.asarray(old, dtype=float)
-    new = np.asarray(new, dtype=float)
-    out = np.full_like(new, np.nan, dtype=float)
-    mask = old != 0
-    out[mask] = new[mask] / old[mask] - 1
-    return out
-
-yoy_total = (total_2025/total_2024 - 1) if total_2024 != 0 else np.nan
-yoy_q = yoy(q_2025, q_2024)
-yoy_m = yoy(monthly_2025, monthly_2024)
+
+metrics = growth_metrics(monthly_2025, monthly_2024)
+q_2024 = metrics["q_prev"]
+q_2025 = metrics["q_cur"]
+
+yoy_total = yoy(total_2025, total_2024)
+yoy_q = metrics["q_yoy"]
+yoy_m = metrics["yoy"]
 
 
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS", "DejaVu Sans"]
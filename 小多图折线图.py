@@ -3,6 +3,8 @@
 import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
 
 mpl.rcParams["axes.unicode_minus"] = False
 mpl.rcParams["font.sans-serif"] = [
@@ -47,18 +49,26 @@ fig, axes = plt.subplots(
 )
 
 
-for ax, focus_cat in zip(axes, cats):
-    for cat in cats:
-        y = np.array(data[cat], dtype=float)
-        if cat == focus_cat:
-            continue
-        ax.plot(
-            years, y,
-            color=bg_color, linewidth=2.5,
-            solid_capstyle="round", zorder=1
-        )
+# 灰色背景层：全部类别的折线合成一条复合路径，只构建一次，各面板共用同一个 Path；
+# 本面板的类别也在其中，由更粗的高亮线直接盖住
+values = np.array([data[c] for c in cats], dtype=float)
+context_path = Path.make_compound_path(
+    *(Path(np.column_stack([years, v])) for v in values)
+)
+
+def context_layer():
+    """引用共享 context_path 的灰线图层（每个面板只新建一个轻量 PathPatch）。"""
+    return PathPatch(
+        context_path, fill=False,
+        edgecolor=bg_color, linewidth=2.5,
+        capstyle="round", joinstyle="round", zorder=1
+    )
+
+
+for i, (ax, focus_cat) in enumerate(zip(axes, cats)):
+    ax.add_patch(context_layer())
 
-    y_focus = np.array(data[focus_cat], dtype=float)
+    y_focus = values[i]
     ax.plot(
         years, y_focus,
         color=highlight_color, linewidth=3.5,
@@ -1,7 +1,15 @@
+import hashlib
+import inspect
+
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Arc, Circle, Rectangle, Polygon, Wedge
+from matplotlib.patches import Circle, Rectangle, Polygon, Wedge
 from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib import image as mimage
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -50,6 +58,12 @@ line_width = 23
 # flag 尺寸
 badge_radius = 0.19
 
+# 输出分辨率（徽章位图按此 dpi 预渲染）
+SAVE_DPI = 1200
+
+# 徽章位图磁盘缓存目录
+BADGE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "badges"
+
 min_value = min(d["value"] for d in data)
 max_value = max(d["value"] for d in data)
 
@@ -64,6 +78,35 @@ def pol2cart(r, theta_deg):
     y = center[1] + r * np.sin(theta)
     return x, y
 
+# ============================================================
+# 3b. Arc ranking engine（向量化弧线）
+# ============================================================
+
+# 弧线折线的角度步长（度）；0.5° 在 1200 dpi 下弦高误差远小于 1 像素
+ARC_STEP_DEG = 0.5
+
+def arc_polylines(radii, theta1, theta2, step_deg=ARC_STEP_DEG):
+    """
+    批量计算弧线折线顶点（角度制，从 theta1 画到 theta2）。
+    radii / theta1 / theta2 可为标量或等长数组；所有弧线共用同一归一化角度网格，
+    一次 pol2cart 得到全部顶点，返回 shape (n_arcs, n_pts, 2)。
+    """
+    radii, theta1, theta2 = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(radii, float)),
+        np.asarray(theta1, float),
+        np.asarray(theta2, float),
+    )
+    span = np.abs(theta2 - theta1).max() if radii.size else 0.0
+    n_pts = max(2, int(np.ceil(span / step_deg)) + 1)
+    t = np.linspace(0.0, 1.0, n_pts)
+    theta = theta1[:, None] + (theta2 - theta1)[:, None] * t
+    x, y = pol2cart(radii[:, None], theta)
+    return np.stack([x, y], axis=-1)
+
+def arc_collection(radii, theta1, theta2, step_deg=ARC_STEP_DEG, **kwargs):
+    """一层弧线 -> 单个 LineCollection；数组中靠后的弧线绘制在上层。"""
+    return LineCollection(arc_polylines(radii, theta1, theta2, step_deg), **kwargs)
+
 # ============================================================
 # 4. Flag drawing helpers
 # ============================================================
@@ -185,6 +228,85 @@ def draw_flag_badge(ax, x, y, code, radius=0.19, z=30):
     # 内部白边
     ax.add_patch(Circle((x, y), radius * 0.86, facecolor="none", edgecolor=WHITE, linewidth=0.5, zorder=z + 8))
 
+# ============================================================
+# 4b. Flag sprite cache
+# ============================================================
+
+# 徽章位图四周留白（外圈描边会超出 radius 半个线宽）
+BADGE_PAD = 1.15
+
+def _rasterize_badge(code, radius, dpi, scale):
+    """离屏绘制单个徽章，返回透明底 RGBA 数组。scale: 每个数据单位对应的英寸数。"""
+    half = radius * BADGE_PAD
+    side_in = 2 * half * scale
+    fig = Figure(figsize=(side_in, side_in), dpi=dpi)
+    fig.patch.set_alpha(0)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(-half, half)
+    ax.set_ylim(-half, half)
+    ax.axis("off")
+    draw_flag_badge(ax, 0, 0, code, radius=radius)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba(), dtype=np.float32) / 255.0
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+@lru_cache(maxsize=None)
+def badge_fingerprint():
+    """
+    徽章绘制代码（含其引用的颜色等模块常量）的哈希，写入磁盘缓存文件名；
+    修改 draw_flag_badge / draw_star 或配色后自动改用新文件，不会读到旧位图。
+    """
+    h = hashlib.sha1()
+    g = globals()
+    for fn in (_rasterize_badge, draw_flag_badge, draw_star):
+        h.update(inspect.getsource(fn).encode())
+        for name in sorted(_code_names(fn.__code__)):
+            val = g.get(name)
+            if isinstance(val, (str, int, float, tuple)):
+                h.update(f"{name}={val!r}".encode())
+    return h.hexdigest()[:10]
+
+@lru_cache(maxsize=256)
+def badge_sprite(code, radius, dpi, scale):
+    """
+    徽章位图：每个 (code, radius, dpi, scale) 只光栅化一次。
+    内存 LRU 命中直接返回；否则读磁盘缓存；都没有时才真正绘制并落盘。
+    """
+    fname = f"{code}_r{radius:g}_s{scale:.4f}_{dpi:g}dpi_{badge_fingerprint()}.png"
+    path = BADGE_CACHE_DIR / fname
+    if path.exists():
+        sprite = mimage.imread(path)
+    else:
+        sprite = _rasterize_badge(code, radius, dpi, scale)
+        BADGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        mimage.imsave(path, sprite)
+    sprite.flags.writeable = False
+    return sprite
+
+def data_scale(ax):
+    """当前坐标系下，每个数据单位对应的英寸数（需先设定 xlim/ylim 与 aspect）。"""
+    ax.apply_aspect()
+    (x0, _), (x1, _) = ax.transData.transform([(0, 0), (1, 0)])
+    return round((x1 - x0) / ax.figure.dpi, 4)
+
+def place_flag_badge(ax, x, y, code, radius=0.19, z=30, dpi=SAVE_DPI, scale=None):
+    """以单个 imshow 放置预渲染的徽章位图。"""
+    if scale is None:
+        scale = data_scale(ax)
+    half = radius * BADGE_PAD
+    ax.imshow(
+        badge_sprite(code, radius, dpi, scale),
+        extent=(x - half, x + half, y - half, y + half),
+        interpolation="antialiased", zorder=z
+    )
+
 # ============================================================
 # 5. Create figure
 # ============================================================
@@ -193,6 +315,12 @@ fig, ax = plt.subplots(figsize=(8, 8), dpi=180)
 ax.set_aspect("equal")
 ax.axis("off")
 
+ax.set_xlim(-0.25, 11.45)
+ax.set_ylim(-0.95, 10.35)
+
+# 徽章位图尺寸依赖坐标范围，需在固定 xlim/ylim 之后计算
+badge_scale = data_scale(ax)
+
 # ============================================================
 # 6. Background guide lines
 # ============================================================
@@ -211,59 +339,58 @@ for val in [5, 10, 15, 20, 25]:
 # 7. Main arcs, labels, flags and values
 # ============================================================
 
-for i, d in enumerate(data):
-    r = radii[i]
-    theta_end = value_to_angle(d["value"])
+values = np.array([d["value"] for d in data], dtype=float)
+theta_ends = value_to_angle(values)
 
-    # 主弧线
-    ax.add_patch(
-        Arc(center, 2 * r, 2 * r, theta1=theta_end, theta2=theta_bottom,
-            linewidth=line_width, color=BAR, capstyle="round", zorder=20 + i)
-    )
+# 主弧线：整层一个 LineCollection（内圈在数组靠后，绘制时压在外圈之上）
+ax.add_collection(
+    arc_collection(radii, theta_ends, theta_bottom,
+                   linewidths=line_width, colors=BAR, capstyle="round", zorder=20),
+    autolim=False
+)
 
-    # 弧线内部细高光
-    ax.add_patch(
-        Arc(center, 2 * r, 2 * r, theta1=theta_end + 1.2, theta2=theta_bottom - 1.5,
-            linewidth=1.0, color=BAR_HIGHLIGHT, alpha=0.30, zorder=50 + i)
-    )
+# 弧线内部细高光
+ax.add_collection(
+    arc_collection(radii, theta_ends + 1.2, theta_bottom - 1.5,
+                   linewidths=1.0, colors=BAR_HIGHLIGHT, alpha=0.30, zorder=50),
+    autolim=False
+)
 
-    # ============================================================
-    # Flag / Value / Country name placement
-    # ============================================================
+# ============================================================
+# Flag / Value / Country name placement
+# ============================================================
 
-    # 1. Flag: 放在柱体终点附近（内部）
-    flag_offset_len = 0.25
-    flag_offset_deg = np.degrees(flag_offset_len / r)
-    flag_theta = theta_end + flag_offset_deg
-    fx, fy = pol2cart(r, flag_theta)
+# 1. Flag: 放在柱体终点附近（内部）
+flag_offset_len = 0.25
+flag_theta = theta_ends + np.degrees(flag_offset_len / radii)
+flag_x, flag_y = pol2cart(radii, flag_theta)
 
-    draw_flag_badge(ax, fx, fy, d["flag"], radius=badge_radius, z=100 + i)
+# 2. 黑色数值: 放在柱体终点前方（外部）
+value_offset_len = 0.35
+value_theta = theta_ends - np.degrees(value_offset_len / radii)
+value_x, value_y = pol2cart(radii, value_theta)
 
-    # 2. 黑色数值: 放在柱体终点前方（外部）
-    value_offset_len = 0.35
-    value_offset_deg = np.degrees(value_offset_len / r)
-    value_theta = theta_end - value_offset_deg
-    vx, vy = pol2cart(r, value_theta)
+# 3. Country name: 放在 flag 后方（内部）
+name_gap_len = 0.32
+label_theta = flag_theta + np.degrees(name_gap_len / radii)
+label_x, label_y = pol2cart(radii, label_theta)
+
+for i, d in enumerate(data):
+    place_flag_badge(ax, flag_x[i], flag_y[i], d["flag"], radius=badge_radius, z=100 + i, scale=badge_scale)
 
     ax.text(
-        vx, vy, str(d["value"]),
+        value_x[i], value_y[i], str(d["value"]),
         fontsize=10.0, color="black", fontweight="bold",
-        rotation=value_theta - 90, rotation_mode="anchor",
+        rotation=value_theta[i] - 90, rotation_mode="anchor",
         ha="left", va="center", zorder=130
     )
 
-    # 3. Country name: 放在 flag 后方（内部）
-    name_gap_len = 0.32
-    name_gap_deg = np.degrees(name_gap_len / r)
-    label_theta = flag_theta + name_gap_deg
-    lx, ly = pol2cart(r, label_theta)
-
     label_size = 7.8 if len(d["country"]) <= 10 else 6.8
 
     ax.text(
-        lx, ly, d["country"],
+        label_x[i], label_y[i], d["country"],
         fontsize=label_size, color=WHITE, fontweight="bold",
-        rotation=label_theta - 90, rotation_mode="anchor",
+        rotation=label_theta[i] - 90, rotation_mode="anchor",
         ha="right", va="center", zorder=90
     )
 
@@ -319,21 +446,15 @@ ax.annotate(
 )
 
 # ============================================================
-# 11. Final frame and save
+# 11. Save
 # ============================================================
 
-ax.set_xlim(-0.25, 11.45)
-ax.set_ylim(-0.95, 10.35)
-
-ax.set_xlim(-0.25, 11.45)
-ax.set_ylim(-0.95, 10.35)
-
 # 核心：保存为带 Alpha 通道（透明底）的 PNG 格式
 plt.savefig(
     "transparent_chart.png", 
     transparent=True,       # 强制透明背景
     bbox_inches="tight",    # 裁切多余边缘
-    dpi=1200                 # 输出高分辨率图片
+    dpi=SAVE_DPI             # 输出高分辨率图片
 )
 
 plt.show()
@@ -1,14 +1,15 @@
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
-from matplotlib.patches import Wedge
-import math
+from matplotlib.collections import PolyCollection, LineCollection
+from matplotlib.colors import to_rgb
 
 
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS"]
 plt.rcParams["axes.unicode_minus"] = False
 
 
-unit = "万元"  
+unit = "万元"
 
 data = {
     "菲律宾": {"锂电储能柜": 420, "户用套装": 310, "逆变器": 160, "太阳能板": 110},
@@ -17,90 +18,161 @@ data = {
     "加纳": {"锂电储能柜": 210, "户用套装": 160, "逆变器": 100, "太阳能板": 60},
 }
 
-countries = list(data.keys())
-country_totals = {c: sum(data[c].values()) for c in countries}
-grand_total = sum(country_totals.values())
-
-countries = sorted(countries, key=lambda c: country_totals[c], reverse=True)
+# 扁平表：每行一个叶子，path 为层级路径（任意深度，也可写成 "菲律宾/逆变器" 字符串）
+table = pd.DataFrame(
+    [{"path": (c, cat), "value": v} for c, cats in data.items() for cat, v in cats.items()]
+)
 
 
 base_colors = [
-    "#FF3B30",  
-    "#1F2A44",  
-    "#C61D2C",  
-    "#2B3550",  
-    "#FF6A63", 
-    "#3B4768",  
+    "#FF3B30",
+    "#1F2A44",
+    "#C61D2C",
+    "#2B3550",
+    "#FF6A63",
+    "#3B4768",
 ]
-def lighten(hex_color, factor=0.25):
-    hex_color = hex_color.lstrip("#")
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-    r = int(r + (255 - r) * factor)
-    g = int(g + (255 - g) * factor)
-    b = int(b + (255 - b) * factor)
-    return f"#{r:02X}{g:02X}{b:02X}"
+def lighten(rgb, factor=0.25):
+    """向白色插值；rgb 为 (..., 3) 的 0~1 数组，factor 可为标量或可广播数组。"""
+    rgb = np.asarray(rgb, dtype=float)
+    factor = np.asarray(factor, dtype=float)[..., None]
+    return rgb + (1.0 - rgb) * factor
 
-country_color = {}
-for i, c in enumerate(countries):
-    country_color[c] = base_colors[i % len(base_colors)]
+
+def pol2cart(r, theta_deg):
+    theta = np.deg2rad(theta_deg)
+    return r * np.cos(theta), r * np.sin(theta)
+
+
+# -----------------------------
+# 1) 层级布局：每层一次 groupby + 组内 cumsum
+# -----------------------------
+def _split_paths(paths, sep):
+    return [tuple(p.split(sep)) if isinstance(p, str) else tuple(p) for p in paths]
+
+def sunburst_layout(table, path_col="path", value_col="value", sep="/", start_angle=90.0):
+    """
+    table: 扁平表，path_col 为层级路径（tuple/list 或以 sep 分隔的字符串），value_col 为叶子数值。
+    返回 rings：每层一个 DataFrame（由内到外），列包括
+      0..k     该节点的路径前缀
+      value    节点合计值
+      parent   父节点在上一层 ring 中的行号（第 0 层为 -1）
+      sib      在兄弟节点中的名次（按值降序，0 起）
+      theta1, theta2   起止角度（度，顺时针排布，theta1 < theta2）
+    同层节点先按父节点顺序、再按值降序排列；角度由父节点起点 + 组内累计和得到。
+    """
+    paths = _split_paths(table[path_col], sep)
+    depth = max(len(p) for p in paths)
+    levels = pd.DataFrame([p + (None,) * (depth - len(p)) for p in paths], columns=range(depth))
+    levels["value"] = pd.to_numeric(table[value_col], errors="coerce").fillna(0.0).to_numpy(float)
+    levels = levels[levels["value"] > 0]
+    total = levels["value"].sum()
+
+    rings = []
+    for k in range(depth):
+        keys = list(range(k + 1))
+        node = (levels.dropna(subset=[k])
+                .groupby(keys, sort=False)["value"].sum()
+                .reset_index())
+
+        if k == 0:
+            node["parent"] = -1
+            node["_porder"] = 0
+            node["_pstart"] = 0.0
+        else:
+            prev = rings[-1]
+            parent = prev[keys[:-1]].copy()
+            parent["parent"] = np.arange(len(prev))
+            parent["_porder"] = parent["parent"]
+            parent["_pstart"] = prev["start"].to_numpy()
+            node = node.merge(parent, on=keys[:-1], how="left")
+
+        node = node.sort_values(["_porder", "value"], ascending=[True, False], kind="stable")
+        grouped = node.groupby("_porder", sort=False)
+        node["sib"] = grouped.cumcount()
+        node["start"] = node["_pstart"] + grouped["value"].cumsum() - node["value"]
+        node["theta2"] = start_angle - 360.0 * node["start"] / total
+        node["theta1"] = node["theta2"] - 360.0 * node["value"] / total
+
+        rings.append(node.drop(columns=["_porder", "_pstart"]).reset_index(drop=True))
+    return rings
+
+def sunburst_colors(rings, base_colors):
+    """
+    第 0 层按顺序循环取 base_colors；
+    其余层在父节点颜色上按兄弟名次变浅（层级越深变浅幅度越小）。
+    返回每层一个 (n, 3) 的 RGB 数组。
+    """
+    base = np.array([to_rgb(c) for c in base_colors])
+    colors = [base[np.arange(len(rings[0])) % len(base)]]
+    for k, ring in enumerate(rings[1:], start=1):
+        sib = ring["sib"].to_numpy()
+        factor = (0.18 + 0.18 * (sib % 4)) * 0.5 ** (k - 1)
+        colors.append(lighten(colors[-1][ring["parent"].to_numpy()], factor))
+    return colors
+
+
+# -----------------------------
+# 2) 渲染：每层一个 PolyCollection
+# -----------------------------
+def annular_sector_verts(theta1, theta2, r_in, r_out, step_deg=2.0):
+    """批量生成环形扇区多边形顶点，返回 shape (n, 2*m, 2)。"""
+    theta1 = np.asarray(theta1, float)
+    theta2 = np.asarray(theta2, float)
+    span = (theta2 - theta1).max() if theta1.size else 0.0
+    m = max(2, int(np.ceil(span / step_deg)) + 1)
+    th = theta1[:, None] + (theta2 - theta1)[:, None] * np.linspace(0.0, 1.0, m)
+    outer = np.stack(pol2cart(r_out, th), axis=-1)
+    inner = np.stack(pol2cart(r_in, th[:, ::-1]), axis=-1)
+    return np.concatenate([outer, inner], axis=1)
+
+def draw_sunburst(ax, rings, colors, radii, edgecolor="white", linewidths=(1.2, 1.1)):
+    """radii: 各环边界半径（长度 = 层数 + 1）。返回每层的 PolyCollection。"""
+    collections = []
+    for k, (ring, rgb) in enumerate(zip(rings, colors)):
+        lw = linewidths[min(k, len(linewidths) - 1)]
+        coll = PolyCollection(
+            annular_sector_verts(ring["theta1"], ring["theta2"], radii[k], radii[k + 1]),
+            facecolors=rgb, edgecolors=edgecolor, linewidths=lw
+        )
+        ax.add_collection(coll)
+        collections.append(coll)
+    return collections
 
 
 fig, ax = plt.subplots(figsize=(8, 8), dpi=160)
 ax.set_aspect("equal")
 ax.axis("off")
 
-r0 = 0.38  
-r1 = 0.62   
-r2 = 0.94   
+r0 = 0.38
+r1 = 0.62
+r_max = 0.94
 
-inner_width = r1 - r0
-outer_width = r2 - r1
-
-start_angle = 90.0  
+start_angle = 90.0
 
 label_color = "#2B2B2B"
 line_color = "#B8C0CC"
 
-def pol2cart(r, theta_deg):
-    theta = np.deg2rad(theta_deg)
-    return r * np.cos(theta), r * np.sin(theta)
+rings = sunburst_layout(table, start_angle=start_angle)
+colors = sunburst_colors(rings, base_colors)
+
+# 内圈宽 r1 - r0，其余各层平分 r1 ~ r_max（两层时即 r0 / r1 / r_max）
+radii = np.r_[r0, np.linspace(r1, r_max, len(rings))]
+draw_sunburst(ax, rings, colors, radii=radii)
+
+grand_total = rings[0]["value"].sum()
 
 # -----------------------------
-# 5) 画内圈：国家总量
+# 3) 内圈标注：国家总量
 # -----------------------------
-current_angle = start_angle
-
-country_angle_span = {}
-
-for c in countries:
-    v = country_totals[c]
-    if v <= 0:
-        continue
-    frac = v / grand_total
-    span = 360.0 * frac
-    theta1 = current_angle
-    theta2 = current_angle - span  
-    country_angle_span[c] = (theta2, theta1)  
-
-    w = Wedge(
-        center=(0, 0),
-        r=r1,
-        theta1=theta2,
-        theta2=theta1,
-        width=inner_width,
-        facecolor=country_color[c],
-        edgecolor="white",
-        linewidth=1.2,
-    )
-    ax.add_patch(w)
+inner = rings[0]
+mid = (inner["theta1"] + inner["theta2"]).to_numpy() / 2.0
+tx, ty = pol2cart((r0 + r1) / 2.0, mid)
 
-    mid = (theta1 + theta2) / 2.0
-    tx, ty = pol2cart((r0 + r1) / 2.0, mid)
+for i, (c, v) in enumerate(zip(inner[0], inner["value"])):
     pct = 100.0 * v / grand_total
     ax.text(
-        tx, ty,
+        tx[i], ty[i],
         f"{c}\n{v:.0f}{unit}\n({pct:.1f}%)",
         ha="center", va="center",
         fontsize=10,
@@ -109,62 +181,35 @@ for c in countries:
         linespacing=1.15
     )
 
-    current_angle = theta2
-
-
-for c in countries:
-    if c not in country_angle_span:
-        continue
-    a0, a1 = country_angle_span[c]  
-    total = country_totals[c]
-    cats = list(data[c].items())
-    cats.sort(key=lambda x: x[1], reverse=True)
-
-    ang = a1  
-    for j, (cat, val) in enumerate(cats):
-        if val <= 0:
-            continue
-        frac = val / total
-        span = (a1 - a0) * frac  
-        t1 = ang
-        t2 = ang - span
-
-        col = lighten(country_color[c], factor=0.18 + 0.18 * (j % 4))
-
-        w2 = Wedge(
-            center=(0, 0),
-            r=r2,
-            theta1=t2,
-            theta2=t1,
-            width=outer_width,
-            facecolor=col,
-            edgecolor="white",
-            linewidth=1.1,
-        )
-        ax.add_patch(w2)
-
-        mid = (t1 + t2) / 2.0
-
- 
-        if (span >= 12): 
-            x0, y0 = pol2cart(r2, mid)
-            x1, y1 = pol2cart(r2 + 0.06, mid)
-            align = "left" if x1 >= 0 else "right"
-            x2 = x1 + (0.16 if x1 >= 0 else -0.16)
-            y2 = y1
-
-            ax.plot([x0, x1, x2], [y0, y1, y2], color=line_color, linewidth=1.0)
-
-            pct_in_country = 100.0 * val / total
-            ax.text(
-                x2, y2,
-                f"{cat}  {val:.0f}{unit}  ({pct_in_country:.0f}%)",
-                ha=align, va="center",
-                fontsize=6,
-                color=label_color
-            )
-
-        ang = t2
+# -----------------------------
+# 4) 外圈标注：足够宽的扇区才引线标注（占比相对于上一层的父节点）
+# -----------------------------
+outer = rings[-1]
+leaf_col = len(rings) - 1
+if len(rings) > 1:
+    parent_value = rings[-2]["value"].to_numpy()[outer["parent"].to_numpy()]
+else:
+    parent_value = np.full(len(outer), grand_total)
+span = (outer["theta2"] - outer["theta1"]).to_numpy()
+show = span >= 12
+
+mid = ((outer["theta1"] + outer["theta2"]).to_numpy() / 2.0)[show]
+x0, y0 = pol2cart(r_max, mid)
+x1, y1 = pol2cart(r_max + 0.06, mid)
+x2 = x1 + np.where(x1 >= 0, 0.16, -0.16)
+
+leaders = np.stack([np.c_[x0, y0], np.c_[x1, y1], np.c_[x2, y1]], axis=1)
+ax.add_collection(LineCollection(leaders, colors=line_color, linewidths=1.0))
+
+for cat, val, pv, xt, yt in zip(outer[leaf_col][show], outer["value"][show], parent_value[show], x2, y1):
+    pct_in_parent = 100.0 * val / pv
+    ax.text(
+        xt, yt,
+        f"{cat}  {val:.0f}{unit}  ({pct_in_parent:.0f}%)",
+        ha="left" if xt >= 0 else "right", va="center",
+        fontsize=6,
+        color=label_color
+    )
 
 
 center_circle = plt.Circle((0, 0), r0, color="white")
@@ -180,7 +225,6 @@ ax.text(
     linespacing=1.2
 )
 
-
+ax.autoscale_view()
 plt.tight_layout()
 plt.show()
-
@@ -1,163 +1,136 @@
 import numpy as np
-import matplotlib as mpl
 import matplotlib.pyplot as plt
-from matplotlib import font_manager
-from matplotlib.patches import Rectangle
-
-
-def set_cn_font():
-    candidates = [
-        r"C:\Windows\Fonts\msyh.ttc",
-        r"C:\Windows\Fonts\msyh.ttf",
-        r"C:\Windows\Fonts\simhei.ttf",
-        r"C:\Windows\Fonts\simsun.ttc",
-    ]
-    for fp in candidates:
-        try:
-            font_manager.fontManager.addfont(fp)
-            prop = font_manager.FontProperties(fname=fp)
-            mpl.rcParams["font.family"] = prop.get_name()
-            mpl.rcParams["axes.unicode_minus"] = False
-            return True
-        except Exception:
-            continue
-    mpl.rcParams["axes.unicode_minus"] = False
-    return False
-
-
-set_cn_font()
+
+from cjk_font import use_cjk_font
+
+
+use_cjk_font()
 
 m24 = [13.4, 8.7, 29.0, 24.8, 21.9, 18.0, 20.9, 26.9, 46.9, 22.8, 55.1, 54.8]  # 原 2023 -> 显示为 2024
 m25 = [13.7, 16.7, 38.4, 28.2, 41.4, 29.7, 29.2, 23.0, 53.3, 43.4, 57.6, 70.7]  # 原 2024 -> 显示为 2025
 
-YEAR_L = "2024"
-YEAR_R = "2025"
+YEARS = ["2024", "2025"]
 
 months = [f"{i}月" for i in range(1, 13)]
-quarters = [(0, 3), (3, 6), (6, 9), (9, 12)]
 
-def quarter_sums(m):
-    return [round(sum(m[a:b]), 1) for a, b in quarters]
 
-def quarter_max(m):
-    return [max(m[a:b]) for a, b in quarters]
+# =========================
+# 1) 聚合层：按期间边界 reduceat，一次得到月 / 季 / 年的合计与最大值
+# =========================
+def monthly_from_daily(dates, values):
+    """
+    日度 -> 月度合计。dates 为按时间排序的 datetime64，values 最后一维与 dates 对齐
+    （前面可以有地区等维度）。返回 (月份键 datetime64[M], 月度合计)。
+    """
+    month_keys = np.asarray(dates, dtype="datetime64[D]").astype("datetime64[M]")
+    starts = np.flatnonzero(np.r_[True, month_keys[1:] != month_keys[:-1]])
+    return month_keys[starts], np.add.reduceat(np.asarray(values, float), starts, axis=-1)
+
+def period_aggregates(monthly):
+    """
+    monthly: (..., n_years * 12)，自 1 月起的完整年度（前面可以有地区等维度）。
+    返回 dict，季度 / 年度结果的最后一维分别为 (n_years, 4) / (n_years,)：
+      month   (..., n_years, 12)
+      q_sum / q_max   季度合计 / 季度内最高月
+      y_sum / y_max   年度合计 / 年内最高月
+    """
+    monthly = np.asarray(monthly, dtype=float)
+    n = monthly.shape[-1]
+    if n % 12:
+        raise ValueError("monthly 的长度必须是 12 的整数倍（完整年度）")
+    n_years = n // 12
+    lead = monthly.shape[:-1]
+
+    q_starts = np.arange(0, n, 3)
+    y_starts = np.arange(0, n, 12)
+    return {
+        "month": monthly.reshape(*lead, n_years, 12),
+        "q_sum": np.add.reduceat(monthly, q_starts, axis=-1).reshape(*lead, n_years, 4),
+        "q_max": np.maximum.reduceat(monthly, q_starts, axis=-1).reshape(*lead, n_years, 4),
+        "y_sum": np.add.reduceat(monthly, y_starts, axis=-1),
+        "y_max": np.maximum.reduceat(monthly, y_starts, axis=-1),
+    }
+
+def build_x_positions(n_years, start=0.0, month_step=1.0, q_gap=0.8, year_gap=1.8):
+    """N 年 × 12 月的柱子横坐标，shape (n_years, 12)；季度之间留 q_gap，年度之间再留 year_gap。"""
+    year_w = 12 * month_step + 4 * q_gap + year_gap
+    year, month = np.divmod(np.arange(n_years * 12), 12)
+    x = start + year * year_w + month * month_step + (month // 3) * q_gap
+    return x.reshape(n_years, 12)
+
+
+monthly = np.r_[m24, m25]
+
+agg = period_aggregates(monthly)
+n_years = len(YEARS)
+
+q_sums = np.round(agg["q_sum"], 1)                 # (n_years, 4)
+q_maxs = agg["q_max"]
+totals = np.round(agg["y_sum"]).astype(int)
+best_q = q_sums.argmax(axis=1)
 
-q24 = quarter_sums(m24)
-q25 = quarter_sums(m25)
-qmax24 = quarter_max(m24)
-qmax25 = quarter_max(m25)
+Y_UNIT = "万元"
 
-total24 = round(sum(m24))
-total25 = round(sum(m25))
+HILITE = "#FE762C"
+BASE   = "#504B49"
 
-best_q24 = int(np.argmax(q24))  
-best_q25 = int(np.argmax(q25))  
+x = build_x_positions(n_years, start=0.0, month_step=1.0, q_gap=0.8, year_gap=1.8)
+x_all = x.ravel()
 
-Y_UNIT = "万元"
+quarter_of_month = np.arange(12) // 3
+month_colors = np.where(quarter_of_month[None, :] == best_q[:, None], HILITE, BASE).ravel()
 
-HILITE = "#FE762C"   
-BASE   = "#504B49"   
-
-def build_x_positions(start=0.0, month_step=1.0, q_gap=0.8, year_gap=1.8):
-    x = []
-    cur = start
-    for _ in range(4):
-        for _ in range(3):
-            x.append(cur)
-            cur += month_step
-        cur += q_gap
-    end = cur
-    return np.array(x), end + year_gap
-
-x24, next_start = build_x_positions(start=0.0, month_step=1.0, q_gap=0.8, year_gap=1.8)
-x25, _ = build_x_positions(start=next_start, month_step=1.0, q_gap=0.8, year_gap=1.8)
-x_all = np.r_[x24, x25]
-
-def month_colors_by_best_quarter(best_q):
-    colors = []
-    for qi in range(4):
-        c = HILITE if qi == best_q else BASE
-        colors += [c] * 3
-    return colors
-
-c24 = month_colors_by_best_quarter(best_q24)
-c25 = month_colors_by_best_quarter(best_q25)
 
+# =========================
+# 2) 绘图：每一层一次 bar 调用
+# =========================
 fig, ax = plt.subplots(figsize=(16, 7))
 
-vals_all = m24 + m25
-ymax = max(vals_all) * 1.45
+ymax = agg["month"].max() * 1.45
 ax.set_ylim(0, ymax)
 
 bar_w = 0.72
 
-def add_year_bg(x, face="#D9EDF7", alpha=0.18):
-    left = x.min() - 0.9
-    right = x.max() + 0.9
-    ax.add_patch(Rectangle((left, 0), right-left, ymax,
-                           facecolor=face, edgecolor="none",
-                           alpha=alpha, zorder=0))
-
-add_year_bg(x24, face="#E9F2FF", alpha=0.18)
-add_year_bg(x25, face="#E9F2FF", alpha=0.18)
+# 年度底色
+year_left = x[:, 0] - 0.9
+year_right = x[:, -1] + 0.9
+ax.bar(year_left, ymax, width=year_right - year_left, align="edge",
+       color="#E9F2FF", edgecolor="none", alpha=0.18, zorder=0)
 
 pad = ymax * 0.06
 
-def add_quarter_overlay(x, qmax, best_q, alpha=0.10, lw=1.6):
-    for qi, (a, b) in enumerate(quarters):
-        left = x[a] - 0.55
-        right = x[b-1] + 0.55
-        h = min(qmax[qi] + pad, ymax)
-        edge = HILITE if qi == best_q else BASE
-        face = HILITE if qi == best_q else BASE
-        ax.add_patch(Rectangle((left, 0), right-left, h,
-                               facecolor=face, edgecolor=edge,
-                               linewidth=lw, alpha=alpha, zorder=1))
-
-add_quarter_overlay(x24, qmax24, best_q24, alpha=0.10, lw=1.6)
-add_quarter_overlay(x25, qmax25, best_q25, alpha=0.10, lw=1.6)
-
-bars24 = ax.bar(x24, m24, width=bar_w, color=c24, zorder=3)
-bars25 = ax.bar(x25, m25, width=bar_w, color=c25, zorder=3)
-
-def add_month_labels(bars):
-    for b in bars:
-        h = int(round(b.get_height()))
-        ax.text(b.get_x()+b.get_width()/2,
-            b.get_height()+ymax*0.01,
-            f"{h}",
-            ha="center", va="bottom", fontsize=10)
+# 季度框：最佳季度高亮
+q_left = x[:, 0::3].ravel() - 0.55
+q_right = x[:, 2::3].ravel() + 0.55
+q_height = np.minimum(q_maxs.ravel() + pad, ymax)
+q_is_best = (np.arange(4)[None, :] == best_q[:, None]).ravel()
+q_color = np.where(q_is_best, HILITE, BASE)
+ax.bar(q_left, q_height, width=q_right - q_left, align="edge",
+       color=q_color, edgecolor=q_color, linewidth=1.6, alpha=0.10, zorder=1)
 
-add_month_labels(bars24)
-add_month_labels(bars25)
+ax.bar(x_all, agg["month"].ravel(), width=bar_w, color=month_colors, zorder=3)
 
-ax.set_xticks(x_all)
-ax.set_xticklabels(months + months, rotation=0, ha="center", fontsize=10)
-
-def add_quarter_sum_only(x, q_sums, qmax, y_offset=ymax*0.015):
-    for qi, (a, b) in enumerate(quarters):
-        xc = np.mean([x[a], x[b-1]])
-        h = min(qmax[qi] + pad, ymax)
-        ax.text(xc, h + y_offset, f"{int(round(q_sums[qi]))}",
-                ha="center", va="bottom", fontsize=12, zorder=5)
-
-add_quarter_sum_only(x24, q24, qmax24)
-add_quarter_sum_only(x25, q25, qmax25)
-
-ax.text(np.mean([x24[0],x24[-1]]), ymax*0.80,
-        f"{YEAR_L}：{total24}（{Y_UNIT}）",
-        ha="center", fontsize=16,
-        color="#FE762C", fontweight="bold")
-
-ax.text(np.mean([x25[0],x25[-1]]), ymax*0.80,
-        f"{YEAR_R}：{total25}（{Y_UNIT}）",
-        ha="center", fontsize=16,
-        color="#FE762C", fontweight="bold")
-
-ax.text(np.mean([x24[0], x24[-1]]), -ymax*0.07, YEAR_L, ha="center", va="top", fontsize=12)
-ax.text(np.mean([x25[0], x25[-1]]), -ymax*0.07, YEAR_R, ha="center", va="top", fontsize=12)
+for xi, h in zip(x_all, agg["month"].ravel()):
+    ax.text(xi, h + ymax * 0.01, f"{int(round(h))}",
+            ha="center", va="bottom", fontsize=10)
 
-title = rf"$\bf{{{YEAR_L}}}$ vs $\bf{{{YEAR_R}}}$ 月度销售额与季度汇总"
+ax.set_xticks(x_all)
+ax.set_xticklabels(months * n_years, rotation=0, ha="center", fontsize=10)
+
+q_center = (q_left + q_right) / 2
+for xc, h, qs in zip(q_center, q_height, q_sums.ravel()):
+    ax.text(xc, h + ymax * 0.015, f"{int(round(qs))}",
+            ha="center", va="bottom", fontsize=12, zorder=5)
+
+year_center = (x[:, 0] + x[:, -1]) / 2
+for xc, year, total in zip(year_center, YEARS, totals):
+    ax.text(xc, ymax*0.80,
+            f"{year}：{total}（{Y_UNIT}）",
+            ha="center", fontsize=16,
+            color="#FE762C", fontweight="bold")
+    ax.text(xc, -ymax*0.07, year, ha="center", va="top", fontsize=12)
+
+title = rf"$\bf{{{YEARS[0]}}}$ vs $\bf{{{YEARS[-1]}}}$ 月度销售额与季度汇总"
 ax.text(-0.16, 1.18, title, transform=ax.transAxes,
         ha="left", va="top", fontsize=16)
 
@@ -1,3 +1,6 @@
+import csv
+from collections import deque
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patheffects as pe
@@ -23,46 +26,132 @@ months_cn = [f"{i}月" for i in months]
 
 revenue = np.array([650, 320, 420, 937, 520, 710, 280, 740, 450, 600, 153, 364], dtype=float)
 
-mean_val = revenue.mean()
-idx_max = int(np.argmax(revenue))
-idx_min = int(np.argmin(revenue))
+class RollingExtremes:
+    """
+    流式滚动极值：用单调队列维护最近 window 个样本的最大 / 最小值与均值。
+    每个样本入队、出队各一次，总计 O(n)；内存只与 window 有关。
+    并列时取最早出现的样本（与 np.argmax / np.argmin 一致）。
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)  # 窗口内 (t, v)，供重绘时直接取用
+        self._max = deque()                 # (i, t, v)，v 单调不增
+        self._min = deque()                 # (i, t, v)，v 单调不减
+        self._sum = 0.0
+        self.count = 0
+
+    def push(self, t, v):
+        i = self.count
+        if len(self.values) == self.window:
+            self._sum -= self.values[0][1]
+        self.values.append((t, v))
+        self._sum += v
+
+        while self._max and self._max[-1][2] < v:
+            self._max.pop()
+        self._max.append((i, t, v))
+        while self._min and self._min[-1][2] > v:
+            self._min.pop()
+        self._min.append((i, t, v))
+
+        oldest = i - self.window + 1
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+        self.count += 1
+
+    @property
+    def max(self):
+        """窗口内最大值 (t, v)。"""
+        return self._max[0][1:]
+
+    @property
+    def min(self):
+        """窗口内最小值 (t, v)。"""
+        return self._min[0][1:]
+
+    @property
+    def mean(self):
+        return self._sum / len(self.values)
+
+def extreme_spans(stream, window, every=1):
+    """
+    逐条消费 (t, v) 流（生成器、CSV、数据库游标均可），
+    每 every 个样本产出一次当前窗口的高亮区间：{"t_end", "max", "min", "mean"}。
+    """
+    det = RollingExtremes(window)
+    for k, (t, v) in enumerate(stream, start=1):
+        det.push(t, v)
+        if k % every == 0:
+            yield {"t_end": t, "max": det.max, "min": det.min, "mean": det.mean}
+
+def iter_csv_series(path, t_col, v_col):
+    """按行读取 CSV 的 (时间, 数值) 两列，不把整份历史载入内存。"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row[t_col], float(row[v_col])
+
+
+# 12 个月的数组也按流处理：分钟级长流换成 iter_csv_series(...) 并调小 window 即可
+# 用长度为 1 的 deque 只保留最后一次产出，不把每次产出都存进列表，内存保持 O(window)
+span = deque(extreme_spans(enumerate(revenue), window=len(revenue)), maxlen=1)[0]
+
+mean_val = span["mean"]
+idx_max = span["max"][0]
+idx_min = span["min"][0]
 
 x = months.astype(float)
 y = revenue
 
-def catmull_rom_spline(x, y, samples_per_seg=45):
+def samples_for_width(n_points, px_width, px_per_sample=2.0):
+    """按目标像素宽度估算每段采样数：整条曲线约每 px_per_sample 像素一个采样点。"""
+    total = px_width / px_per_sample
+    return max(1, int(np.ceil(total / max(n_points - 1, 1))))
+
+def catmull_rom_spline(x, y, samples_per_seg=45, px_width=None):
+    """
+    均匀 Catmull-Rom 样条，所有段在 (n_segments, samples) 网格上一次性求值。
+    samples_per_seg=None 时由 px_width（曲线所占水平像素数）自适应决定，
+    长序列不会在一个像素内堆叠大量采样点。
+    """
     x = np.asarray(x, float)
     y = np.asarray(y, float)
     n = len(x)
     if n < 4:
         raise ValueError("Catmull-Rom spline needs at least 4 points.")
+    if samples_per_seg is None:
+        if px_width is None:
+            raise ValueError("samples_per_seg=None requires px_width.")
+        samples_per_seg = samples_for_width(n, px_width)
+
     x_pad = np.r_[x[0] - (x[1] - x[0]), x, x[-1] + (x[-1] - x[-2])]
     y_pad = np.r_[y[0] - (y[1] - y[0]), y, y[-1] + (y[-1] - y[-2])]
-    xs_all, ys_all = [], []
-    for i in range(1, n):
-        p0 = np.array([x_pad[i-1], y_pad[i-1]])
-        p1 = np.array([x_pad[i],   y_pad[i]])
-        p2 = np.array([x_pad[i+1], y_pad[i+1]])
-        p3 = np.array([x_pad[i+2], y_pad[i+2]])
-        t = np.linspace(0, 1, samples_per_seg, endpoint=False)
-        t2 = t * t
-        t3 = t2 * t
-        a = 2 * p1
-        b = (-p0 + p2)
-        c = (2*p0 - 5*p1 + 4*p2 - p3)
-        d = (-p0 + 3*p1 - 3*p2 + p3)
-        pts = 0.5 * (a + np.outer(t, b) + np.outer(t2, c) + np.outer(t3, d))
-        xs_all.append(pts[:, 0])
-        ys_all.append(pts[:, 1])
-    xs = np.concatenate(xs_all + [np.array([x[-1]])])
-    ys = np.concatenate(ys_all + [np.array([y[-1]])])
+    pad = np.column_stack([x_pad, y_pad])[:, None, :]        # (n + 2, 1, 2)
+    p0, p1, p2, p3 = pad[:-3], pad[1:-2], pad[2:-1], pad[3:]  # 各 (n - 1, 1, 2)
+
+    t = np.linspace(0, 1, samples_per_seg, endpoint=False)[None, :, None]
+    t2 = t * t
+    t3 = t2 * t
+    a = 2 * p1
+    b = (-p0 + p2)
+    c = (2*p0 - 5*p1 + 4*p2 - p3)
+    d = (-p0 + 3*p1 - 3*p2 + p3)
+    pts = 0.5 * (a + t * b + t2 * c + t3 * d)                # (n - 1, samples, 2)
+
+    pts = pts.reshape(-1, 2)
+    xs = np.r_[pts[:, 0], x[-1]]
+    ys = np.r_[pts[:, 1], y[-1]]
     return xs, ys
 
-xs, ys = catmull_rom_spline(x, y, samples_per_seg=45)
-
 fig = plt.figure(figsize=(7.6, 9.2), dpi=220)
 ax = fig.add_axes([0.08, 0.20, 0.84, 0.62])
 
+# 曲线所占像素宽度决定采样密度（长序列按像素采样，而不是固定每段 45 点）
+px_width = ax.get_position().width * fig.get_figwidth() * fig.dpi
+xs, ys = catmull_rom_spline(x, y, samples_per_seg=None, px_width=px_width)
+
 ax.axvspan(x[idx_max]-0.38, x[idx_max]+0.38, color="#CDEFD8", alpha=0.85, zorder=0)
 ax.axvspan(x[idx_min]-0.38, x[idx_min]+0.38, color="#F2D6D6", alpha=0.85, zorder=0)
 
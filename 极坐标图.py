@@ -1,38 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
-import matplotlib.font_manager as fm
-import os
-
-
-
-def setup_font():
-    win_font_candidates = [
-        r"C:\Windows\Fonts\msyh.ttc",   
-        r"C:\Windows\Fonts\msyh.ttf",
-        r"C:\Windows\Fonts\simhei.ttf", 
-        r"C:\Windows\Fonts\simsun.ttc", 
-    ]
-    for fp in win_font_candidates:
-        if os.path.exists(fp):
-            try:
-                fm.fontManager.addfont(fp)
-                name = fm.FontProperties(fname=fp).get_name()
-                plt.rcParams["font.sans-serif"] = [name]
-                break
-            except Exception:
-                pass
-
-    if not plt.rcParams.get("font.sans-serif"):
-        candidates = ["Microsoft YaHei", "SimHei", "Noto Sans CJK SC", "Source Han Sans CN", "Arial Unicode MS"]
-        available = {f.name for f in fm.fontManager.ttflist}
-        for name in candidates:
-            if name in available:
-                plt.rcParams["font.sans-serif"] = [name]
-                break
-
-    plt.rcParams["axes.unicode_minus"] = False
 
+from cjk_font import use_cjk_font
 
 
 def make_virtual_sales(n_months=12,
@@ -171,7 +141,7 @@ def plot_polar_area(month_labels,
 
 
 if __name__ == "__main__":
-    setup_font()
+    use_cjk_font()
 
     months, products, values = make_virtual_sales(
         n_months=12,
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import FancyBboxPatch
 import matplotlib.gridspec as gridspec
 
+from growth_metrics import growth_metrics
+
 plt.rcParams["font.sans-serif"] = ["SimHei", "Microsoft YaHei", "Arial Unicode MS"]
 plt.rcParams["axes.unicode_minus"] = False
 
@@ -11,13 +13,14 @@ labels = [f"{m}月" for m in months]
 
 y2024 = np.array([55, 92, 130, 88, 84, 105, 86, 112, 98, 80, 110, 83]) * 1000
 y2025 = np.array([19, 150, 94, 100, 109, 127, 90, 113, 141, 55, 109, 100]) * 1000
-yoy = (y2025 / y2024 - 1) * 100
+metrics = growth_metrics(y2025, y2024)
+yoy = metrics["yoy"] * 100
 
 sum_2024 = int(y2024.sum())
 sum_2025 = int(y2025.sum())
 share_2024 = 0.10
 share_2025 = 0.11
-yoy_total = (sum_2025 / sum_2024 - 1) * 100
+yoy_total = metrics["total_yoy"] * 100
 
 fig = plt.figure(figsize=(14, 7), dpi=150)
 gs = gridspec.GridSpec(nrows=1, ncols=2, width_ratios=[1.05, 2.95], wspace=0.15)
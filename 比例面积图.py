@@ -11,8 +11,12 @@ Square Area Map（比例面积图，正方形）
 """
 
 import math
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PolyCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.text import Text
 
 # -----------------------------
 # 1) 虚拟数据（可改）
@@ -129,11 +133,168 @@ def compute_layout(values, canvas_px=1200, outer_margin_px=90, gap_px=28):
         "E": (E_x, E_y, side["E"]),
     }
 
+# -----------------------------
+# 3b) 通用比例面积布局（N 个加权项，treemap 式）
+#     一次排序 + 一次线性扫描，结果为 NumPy 数组
+# -----------------------------
+def _worst_ratio(a_max, a_min, row_sum, short):
+    """一行（沿短边排布）中最差的长宽比；行内按降序排列，首项最大、末项最小。"""
+    s2 = row_sum * row_sum
+    l2 = short * short
+    return max(l2 * a_max / s2, s2 / (l2 * a_min))
+
+def squarify_layout(values, x=0.0, y=0.0, width=1.0, height=1.0):
+    """
+    Squarified treemap：把 values 按面积比例铺满矩形 (x, y, width, height)，
+    从左上角开始由大到小排布。返回 (xs, ys, ws, hs) 四个数组，顺序与 values 一致；非正值得到零面积矩形。
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    xs = np.full(n, float(x))
+    ys = np.full(n, float(y))
+    ws = np.zeros(n)
+    hs = np.zeros(n)
+
+    idx = np.flatnonzero(values > 0)
+    if idx.size == 0:
+        return xs, ys, ws, hs
+    order = idx[np.argsort(-values[idx], kind="stable")]
+    areas = values[order] * (width * height / values[order].sum())
+
+    i, m = 0, len(order)
+    while i < m:
+        short = min(width, height)
+        row_sum = areas[i]
+        worst = _worst_ratio(areas[i], areas[i], row_sum, short)
+        j = i + 1
+        while j < m:
+            cand = _worst_ratio(areas[i], areas[j], row_sum + areas[j], short)
+            if cand > worst:
+                break
+            worst = cand
+            row_sum += areas[j]
+            j += 1
+        if j == m:
+            # 最后一行吃掉剩余空间，消除浮点累积误差
+            row_sum = width * height
+
+        row = order[i:j]
+        thick = row_sum / short
+        lengths = areas[i:j] / thick
+        offsets = np.r_[0.0, np.cumsum(lengths)[:-1]]
+        if width >= height:
+            # 竖条靠左，自上而下排布
+            xs[row], ys[row] = x, y + height - offsets - lengths
+            ws[row], hs[row] = thick, lengths
+            x += thick
+            width -= thick
+        else:
+            # 横条靠上，自左向右排布
+            xs[row], ys[row] = x + offsets, y + height - thick
+            ws[row], hs[row] = lengths, thick
+            height -= thick
+        i = j
+    return xs, ys, ws, hs
+
+def slice_dice_layout(values, x=0.0, y=0.0, width=1.0, height=1.0):
+    """
+    Slice-and-dice：沿长边按比例切条（保持输入顺序，从左/上开始），纯向量化。
+    非正值得到零面积矩形；全部非正（或为空）时全部为零面积矩形。
+    """
+    values = np.clip(np.asarray(values, dtype=float), 0.0, None)
+    n = len(values)
+    if not np.any(values > 0):
+        return np.full(n, float(x)), np.full(n, float(y)), np.zeros(n), np.zeros(n)
+    frac = values / values.sum()
+    edges = np.r_[0.0, np.cumsum(frac)[:-1]]
+    if width >= height:
+        return x + edges * width, np.full(n, float(y)), frac * width, np.full(n, float(height))
+    return np.full(n, float(x)), y + height - (edges + frac) * height, np.full(n, float(width)), frac * height
+
+TREEMAP_LAYOUTS = {"squarify": squarify_layout, "slice": slice_dice_layout}
+
+def rect_verts(xs, ys, ws, hs, gap=0.0):
+    """矩形数组 -> PolyCollection 顶点 (n, 4, 2)；每边内缩 gap/2 形成缝隙。"""
+    g = gap / 2.0
+    x0 = xs + np.minimum(g, ws / 2)
+    x1 = xs + ws - np.minimum(g, ws / 2)
+    y0 = ys + np.minimum(g, hs / 2)
+    y1 = ys + hs - np.minimum(g, hs / 2)
+    return np.stack([np.c_[x0, y0], np.c_[x1, y0], np.c_[x1, y1], np.c_[x0, y1]], axis=1)
+
 # -----------------------------
 # 4) 标注：例图2样式（左上两行），避免重叠
+#    文字尺寸走度量缓存 + 二分求字号，不再反复 fig.canvas.draw()
 # -----------------------------
+_TEXT_METRICS = {}
+
+def text_extent(fig, text, prop):
+    """
+    (string, font, size) -> (w, h) 像素，结果缓存。
+    用一个不加入画布的探针 Text 计算布局（与实际绘制的行高/下沉规则一致），
+    只做文字度量，不触发整图渲染。
+    """
+    key = (text, prop, fig.dpi)
+    hit = _TEXT_METRICS.get(key)
+    if hit is None:
+        probe = Text(0, 0, text, fontproperties=prop)
+        probe.set_figure(fig)
+        bb = probe.get_window_extent(fig.canvas.get_renderer())
+        hit = _TEXT_METRICS[key] = (bb.width, bb.height)
+    return hit
+
 def _intersect(b1, b2):
-    return not (b1.x1 <= b2.x0 or b1.x0 >= b2.x1 or b1.y1 <= b2.y0 or b1.y0 >= b2.y1)
+    return not (b1[2] <= b2[0] or b1[0] >= b2[2] or b1[3] <= b2[1] or b1[1] >= b2[3])
+
+def _inside(b, box):
+    return b[0] >= box[0] and b[2] <= box[2] and b[1] >= box[1] and b[3] <= box[3]
+
+def fit_label_sizes(fig, box, label_anchor, value_anchor, name, value_text, lf0, vf0,
+                    shrink=0.96, max_iter=70, min_lf=12, min_vf=11):
+    """
+    求标注字号：字母与金额同比例缩小（每步 ×shrink），直到都在 box 内且互不重叠。
+    box / anchor 均为像素坐标；value_anchor 为金额“顶部”锚点，放不下时改为 box 左下角。
+    返回 (lf, vf, value_at_bottom)。
+
+    缩小只会让文字更容易放下，可行性对缩小步数单调，因此用二分代替逐步重绘；
+    金额是否改到左下只取决于初始字号（之后只会越来越小）。
+    """
+    lfs, vfs = [lf0], [vf0]
+    for _ in range(max_iter):
+        lfs.append(lfs[-1] * shrink)
+        vfs.append(vfs[-1] * shrink)
+    # 字号低于下限时停止缩小（停在首个越界的字号上）
+    stop = next((k for k in range(1, max_iter + 1) if lfs[k] < min_lf or vfs[k] < min_vf), max_iter)
+
+    lx, ly = label_anchor
+
+    def boxes(k, at_bottom):
+        w1, h1 = text_extent(fig, name, FontProperties(size=lfs[k], weight="bold"))
+        w2, h2 = text_extent(fig, value_text, FontProperties(size=vfs[k]))
+        b1 = (lx, ly - h1, lx + w1, ly)
+        if at_bottom:
+            b2 = (box[0], box[1], box[0] + w2, box[1] + h2)
+        else:
+            vx, vy = value_anchor
+            b2 = (vx, vy - h2, vx + w2, vy)
+        return b1, b2
+
+    def fits(k, at_bottom):
+        b1, b2 = boxes(k, at_bottom)
+        return _inside(b1, box) and _inside(b2, box) and not _intersect(b1, b2)
+
+    if fits(0, False):
+        return lfs[0], vfs[0], False
+    at_bottom = boxes(0, False)[1][1] < box[1]
+
+    lo, hi = 1, stop
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if fits(mid, at_bottom):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lfs[lo], vfs[lo], at_bottom
 
 def add_labels(ax, fig, x, y, s, name, value,
                pad_ratio=0.08,
@@ -145,47 +306,34 @@ def add_labels(ax, fig, x, y, s, name, value,
     scale = max(0.75, min(1.35, s / 260.0))
     lf = base_label_fs * scale
     vf = base_value_fs * scale
+    value_text = f"${int(value)}"
+    value_y = y + s - pad - lf * 1.15
+
+    # 方块内边界（留 pad）与金额锚点，统一换算到像素
+    (box_x0, box_y0), (box_x1, box_y1), value_anchor = ax.transData.transform(
+        [(x + pad, y + pad), (x + s - pad, y + s - pad), (x + pad, value_y)]
+    )
+    box = (box_x0, box_y0, box_x1, box_y1)
+
+    # 若放不下/重叠，则缩小；若金额掉出方块则改为左下（仍保持“字母左上”）
+    lf, vf, at_bottom = fit_label_sizes(
+        fig, box, (box_x0, box_y1), tuple(value_anchor),
+        name, value_text, lf, vf
+    )
 
     # 例图2：金额在字母下方（靠上，不到底部）
     t1 = ax.text(x + pad, y + s - pad, name,
                  ha="left", va="top", color="white",
                  fontsize=lf, fontweight="bold")
-    t2 = ax.text(x + pad, y + s - pad - lf * 1.15, f"${int(value)}",
-                 ha="left", va="top", color="white",
-                 fontsize=vf)
-
-    # 若放不下/重叠，则逐步缩小；若金额掉出方块则改为左下
-    for _ in range(70):
-        fig.canvas.draw()
-        r = fig.canvas.get_renderer()
-        b1 = t1.get_window_extent(renderer=r)
-        b2 = t2.get_window_extent(renderer=r)
-
-        # 方块内边界（留 pad）
-        p0 = ax.transData.transform((x + pad, y + pad))
-        p1 = ax.transData.transform((x + s - pad, y + s - pad))
-        box_x0, box_y0 = p0
-        box_x1, box_y1 = p1
-
-        in_box = (
-            b1.x0 >= box_x0 and b1.x1 <= box_x1 and b1.y0 >= box_y0 and b1.y1 <= box_y1 and
-            b2.x0 >= box_x0 and b2.x1 <= box_x1 and b2.y0 >= box_y0 and b2.y1 <= box_y1
-        )
-        if in_box and (not _intersect(b1, b2)):
-            return
-
-        # 若金额太靠下超界，改为左下（仍保持“字母左上”）
-        if b2.y0 < box_y0:
-            t2.set_position((x + pad, y + pad))
-            t2.set_va("bottom")
-
-        lf *= 0.96
-        vf *= 0.96
-        t1.set_fontsize(lf)
-        t2.set_fontsize(vf)
-
-        if lf < 12 or vf < 11:
-            break
+    if at_bottom:
+        t2 = ax.text(x + pad, y + pad, value_text,
+                     ha="left", va="bottom", color="white",
+                     fontsize=vf)
+    else:
+        t2 = ax.text(x + pad, value_y, value_text,
+                     ha="left", va="top", color="white",
+                     fontsize=vf)
+    return t1, t2
 
 # -----------------------------
 # 5) 绘制（关键：不 tight 裁剪）
@@ -217,6 +365,52 @@ def draw(values, color_map,
     plt.show()
     print(f"Saved: {out_png}")
 
+def draw_treemap(values, color_map,
+                 canvas_px=1200, dpi=200,
+                 outer_margin_px=90,
+                 gap_px=4,
+                 method="squarify",
+                 label_min_px=120,
+                 default_color="#D94A4A",
+                 out_png="treemap_area_map.png"):
+    """
+    任意 N 项的比例面积图：布局由 TREEMAP_LAYOUTS[method] 一次算出，
+    全部方块合成一个 PolyCollection；只给短边 >= label_min_px 的方块加标注。
+    """
+    keys = list(values)
+    vals = np.array([float(values[k]) for k in keys])
+
+    usable = canvas_px - 2 * outer_margin_px
+    xs, ys, ws, hs = TREEMAP_LAYOUTS[method](vals, outer_margin_px, outer_margin_px, usable, usable)
+
+    figsize = (canvas_px / dpi, canvas_px / dpi)
+    fig = plt.figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_axes([0, 0, 1, 1])
+
+    ax.set_xlim(0, canvas_px)
+    ax.set_ylim(0, canvas_px)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+    ax.add_patch(Rectangle((0, 0), canvas_px, canvas_px, facecolor="white", edgecolor="none"))
+
+    ax.add_collection(PolyCollection(
+        rect_verts(xs, ys, ws, hs, gap=gap_px),
+        facecolors=[color_map.get(k, default_color) for k in keys],
+        edgecolors="none"
+    ), autolim=False)
+
+    # 标注放在每个矩形左上角的正方形区域内
+    side = np.minimum(ws, hs) - gap_px
+    for i in np.flatnonzero(side >= label_min_px):
+        x0 = xs[i] + gap_px / 2
+        y0 = ys[i] + hs[i] - gap_px / 2 - side[i]
+        add_labels(ax, fig, x0, y0, side[i], keys[i], vals[i])
+
+    fig.savefig(out_png, facecolor="white")
+    plt.show()
+    print(f"Saved: {out_png}")
+
 if __name__ == "__main__":
     # gap_px 建议范围：18~35（越小越紧凑）
     draw(data, colors, canvas_px=1200, dpi=200, outer_margin_px=90, gap_px=26, out_png="square_area_map.png")
@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import Normalize
 from matplotlib.cm import ScalarMappable
 
+from render_cache import cached_savefig
+
 
 plt.rcParams["font.sans-serif"] = ["Microsoft YaHei"]
 plt.rcParams["axes.unicode_minus"] = False
@@ -57,79 +59,93 @@ company_name = df_top[category_name_col].tolist()
 growth_data = df_top["总计"].tolist()
 
 
-fig, ax = plt.subplots(figsize=(8, 8), subplot_kw={"projection": "polar"}, dpi=150)
-
-max_value = max(growth_data) * 1.2
-colors = create_colors(["#214e81", "#a5d57d"], growth_data)
-
-initial_radius = 15
-ring_width = 2
-ring_gap = 1
-
-for i, (label, value) in enumerate(zip(company_name, growth_data)):
-    inner_radius = initial_radius + i * (ring_width + ring_gap)
-    theta_start = 0
-    theta_end = (value / max_value) * 2 * np.pi
-
-    ax.bar(
-        x=(theta_start + theta_end) / 2,
-        height=ring_width,
-        width=theta_end - theta_start,
-        bottom=inner_radius,
-        color=colors[i],
-        alpha=0.85,
+def plot_ring_bars(company_name, growth_data, title="消费总量各类汇总（单位：吨）"):
+    """每个类别一圈环形柱，弧长与数值成正比，返回 Figure。"""
+    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw={"projection": "polar"}, dpi=150)
+
+    max_value = max(growth_data) * 1.2
+    colors = create_colors(["#214e81", "#a5d57d"], growth_data)
+
+    initial_radius = 15
+    ring_width = 2
+    ring_gap = 1
+
+    for i, (label, value) in enumerate(zip(company_name, growth_data)):
+        inner_radius = initial_radius + i * (ring_width + ring_gap)
+        theta_start = 0
+        theta_end = (value / max_value) * 2 * np.pi
+
+        ax.bar(
+            x=(theta_start + theta_end) / 2,
+            height=ring_width,
+            width=theta_end - theta_start,
+            bottom=inner_radius,
+            color=colors[i],
+            alpha=0.85,
+        )
+
+        if theta_end < np.pi / 2:
+            text_attr = {
+                "color": colors[i],
+                "rotation": np.degrees(theta_end) + 5,
+                "ha": "left",
+            }
+        else:
+            text_attr = {
+                "color": "#ffffff",
+                "rotation": np.degrees(theta_end - np.pi) - 5,
+                "ha": "left",
+            }
+
+        ax.text(
+            x=(theta_start + theta_end),
+            y=inner_radius + ring_width / 2,
+            s=f"{value:.1f}",
+            va="center",
+            fontsize=8,
+            fontweight="bold",
+            rotation_mode="anchor",
+            **text_attr,
+        )
+
+        ax.text(
+            x=0,
+            y=inner_radius + ring_width / 2,
+            s=label,
+            ha="right",
+            va="center",
+            color=colors[i],
+            fontsize=8,
+            fontweight="bold",
+            rotation=0,
+            rotation_mode="anchor",
+        )
+
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.grid(False)
+    ax.set_theta_direction(1)
+    ax.set_theta_offset(np.pi * 1.5)
+    ax.spines["polar"].set_visible(False)
+
+    fig.text(
+        0.1, 1.2,
+        title,
+        fontsize=28, ha="left", va="top", fontweight="bold"
     )
 
-    if theta_end < np.pi / 2:
-        text_attr = {
-            "color": colors[i],
-            "rotation": np.degrees(theta_end) + 5,
-            "ha": "left",
-        }
-    else:
-        text_attr = {
-            "color": "#ffffff",
-            "rotation": np.degrees(theta_end - np.pi) - 5,
-            "ha": "left",
-        }
-
-    ax.text(
-        x=(theta_start + theta_end),
-        y=inner_radius + ring_width / 2,
-        s=f"{value:.1f}",
-        va="center",
-        fontsize=8,
-        fontweight="bold",
-        rotation_mode="anchor",
-        **text_attr,
-    )
+    fig.subplots_adjust(left=0.35, right=1.1, top=1.3, bottom=0.15)
+
+    return fig
 
-    ax.text(
-        x=0,
-        y=inner_radius + ring_width / 2,
-        s=label,
-        ha="right",
-        va="center",
-        color=colors[i],
-        fontsize=8,
-        fontweight="bold",
-        rotation=0,
-        rotation_mode="anchor",
-    )
 
-ax.set_xticks([])
-ax.set_yticks([])
-ax.grid(False)
-ax.set_theta_direction(1)
-ax.set_theta_offset(np.pi * 1.5)
-ax.spines["polar"].set_visible(False)
-
-fig.text(
-    0.1, 1.2,
-    "消费总量各类汇总（单位：吨）",
-    fontsize=28, ha="left", va="top", fontweight="bold"
+# 数据与样式不变时直接复用上次编码好的 PNG（见 render_cache.py）
+fig = cached_savefig(
+    "煤炭消费总量环形柱状图_模拟数据.png",
+    plot_ring_bars,
+    company_name,
+    growth_data,
+    savefig_kw=dict(dpi=300, bbox_inches="tight"),
 )
 
-plt.subplots_adjust(left=0.35, right=1.1, top=1.3, bottom=0.15)
-plt.savefig("煤炭消费总量环形柱状图_模拟数据.png", dpi=300, bbox_inches="tight")
 plt.show()
@@ -3,6 +3,10 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.colors import to_rgba
+from matplotlib.text import Text
 from matplotlib import font_manager
 
 df = pd.DataFrame({
@@ -39,16 +43,17 @@ def fmt_pct(r):
         return ""
     return f"{int(round(r*100))}%"
 
-def draw_databar(ax, xL, xR, yC, cell_h, val, min_neg, max_pos,
-                 color_pos="#16a34a", color_neg="#dc2626", alpha=1.0):
+def databar_geometry(vals, xL, xR, cell_h, min_neg, max_pos):
+    """
+    一整列数据条的几何（向量化）：
+    返回 (x0, left, width, is_pos)。x0 为零线位置，left/width 为各条的左端与宽度，
+    值为 0 或 NaN 的行宽度为 0。
+    """
     pad_x = (xR - xL) * 0.04
     barL = xL + pad_x
     barR = xR - pad_x
     barW = barR - barL
 
-    barH = cell_h * 0.32
-    yB = yC - barH / 2
-
     if min_neg < 0 and max_pos > 0:
         zero_pos = (-min_neg) / (max_pos - min_neg)
     elif min_neg < 0 and max_pos <= 0:
@@ -58,78 +63,166 @@ def draw_databar(ax, xL, xR, yC, cell_h, val, min_neg, max_pos,
 
     x0 = barL + zero_pos * barW
 
-    ax.plot([x0, x0], [yC - cell_h*0.35, yC + cell_h*0.35], lw=0.6, color="#d1d5db", zorder=1)
-
-    if val == 0 or (isinstance(val, float) and np.isnan(val)):
-        return
-
-    if val > 0:
-        denom = max_pos if max_pos > 0 else 1.0
-        w = (val / denom) * (barW * (1 - zero_pos))
-        ax.add_patch(Rectangle((x0, yB), w, barH, facecolor=color_pos, edgecolor="none", alpha=alpha, zorder=2))
-    else:
-        denom = abs(min_neg) if min_neg < 0 else 1.0
-        w = (abs(val) / denom) * (barW * zero_pos)
-        ax.add_patch(Rectangle((x0 - w, yB), w, barH, facecolor=color_neg, edgecolor="none", alpha=alpha, zorder=2))
-
-
-n = len(df)
-fig, ax = plt.subplots(figsize=(13.5, 5.2), dpi=200)
-ax.set_xlim(0, 1)
-ax.set_ylim(0, 1)
-ax.axis("off")
-
-x0 = 0.00
-x_country = 0.22
-x_y25 = 0.38
-x_abs = 0.70
-x3 = 1.00
-
-top = 0.96
-bottom = 0.04
-total_h = top - bottom
-row_h = total_h / (n + 1)  
-
-grid = "#e5e7eb"
-header_bg = "#f3f4f6"
-text_c = "#111827"
-
-ax.add_patch(Rectangle((x0, top - row_h), x3 - x0, row_h, facecolor=header_bg, edgecolor="none"))
-
-for xx in [x0, x_country, x_y25, x_abs, x3]:
-    ax.plot([xx, xx], [bottom, top], color=grid, lw=1.0)
-
-for i in range(n + 2):
-    y = top - i * row_h
-    ax.plot([x0, x3], [y, y], color=grid, lw=1.0)
-
-ax.text((x0 + x_country) / 2, top - row_h / 2, "国家", ha="center", va="center", fontsize=11, color=text_c, weight="bold")
-ax.text((x_country + x_y25) / 2, top - row_h / 2, "Y25达成", ha="center", va="center", fontsize=11, color=text_c, weight="bold")
-ax.text((x_y25 + x_abs) / 2, top - row_h / 2, "绝对值增长", ha="center", va="center", fontsize=11, color=text_c, weight="bold")
-ax.text((x_abs + x3) / 2, top - row_h / 2, "同比", ha="center", va="center", fontsize=11, color=text_c, weight="bold")
-
-abs_vals = df["绝对值增长"].astype(float).values
-yoy_vals = df["同比"].astype(float).values
-
-abs_min = min(0.0, float(np.nanmin(abs_vals)))
-abs_max = max(0.0, float(np.nanmax(abs_vals)))
-yoy_min = min(0.0, float(np.nanmin(yoy_vals)))
-yoy_max = max(0.0, float(np.nanmax(yoy_vals)))
-
-for i, row in df.iterrows():
-    y_top_i = top - (i + 1) * row_h
-    yC = y_top_i - row_h / 2
-
-    ax.text(x0 + 0.01, yC, str(row["国家"]), ha="left", va="center", fontsize=10.5, color=text_c)
-
-    ax.text(x_y25 - 0.01, yC, fmt_num(row["Y25达成"]), ha="right", va="center", fontsize=10.5, color=text_c)
-
-    draw_databar(ax, x_y25, x_abs, yC, row_h, float(row["绝对值增长"]), abs_min, abs_max)
-    ax.text(x_abs - 0.01, yC, fmt_num(row["绝对值增长"]), ha="right", va="center", fontsize=10.5, color=text_c)
-
-    draw_databar(ax, x_abs, x3, yC, row_h, float(row["同比"]), yoy_min, yoy_max)
-    ax.text(x3 - 0.01, yC, fmt_pct(float(row["同比"])), ha="right", va="center", fontsize=10.5, color=text_c)
-
-plt.tight_layout()
+    vals = np.nan_to_num(np.asarray(vals, dtype=float), nan=0.0)
+    is_pos = vals > 0
+    denom_pos = max_pos if max_pos > 0 else 1.0
+    denom_neg = abs(min_neg) if min_neg < 0 else 1.0
+    width = np.where(
+        is_pos,
+        vals / denom_pos * (barW * (1 - zero_pos)),
+        np.abs(vals) / denom_neg * (barW * zero_pos),
+    )
+    left = np.where(is_pos, x0, x0 - width)
+    return x0, left, width, is_pos
+
+def rect_verts(left, bottom, width, height):
+    """批量矩形顶点，shape (n, 4, 2)。"""
+    right = left + width
+    top = bottom + height
+    return np.stack([np.c_[left, bottom], np.c_[right, bottom],
+                     np.c_[right, top], np.c_[left, top]], axis=1)
+
+def column_range(vals):
+    """含 0 的列取值范围（所有分页共用，保证各页数据条比例一致）。"""
+    vals = np.asarray(vals, dtype=float)
+    return min(0.0, float(np.nanmin(vals))), max(0.0, float(np.nanmax(vals)))
+
+class TextColumn(Artist):
+    """
+    一整列单元格文字合成一个艺术家：绘制时复用同一个 Text，逐行设置位置与内容后绘制，
+    不为每个单元格各建一个 Text 挂到坐标轴上（创建与管理开销随行数线性增长）。
+    关键字参数（ha、va、fontsize、color 等）与 ax.text 相同，作用于整列。
+    """
+
+    def __init__(self, x, ys, labels, **text_kw):
+        super().__init__()
+        self.x = x
+        self.ys = np.asarray(ys, dtype=float)
+        self.labels = list(labels)
+        self._text = Text(**text_kw)
+        self.set_zorder(self._text.get_zorder())
+
+    def set_figure(self, fig):
+        super().set_figure(fig)
+        self._text.set_figure(fig)
+
+    def set_transform(self, t):
+        super().set_transform(t)
+        self._text.set_transform(t)
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        text = self._text
+        for y, label in zip(self.ys, self.labels):
+            text.set_position((self.x, y))
+            text.set_text(label)
+            text.draw(renderer)
+        self.stale = False
+
+def draw_databar_table(df, start=0, rows=None, figsize=None, dpi=200,
+                       color_pos="#16a34a", color_neg="#dc2626"):
+    """
+    只渲染 df 的第 start .. start+rows 行（虚拟窗口），返回 fig。
+    网格线、零线各一个 LineCollection，数据条一个 PolyCollection；
+    数据条比例按整张表的取值范围计算，翻页时保持一致。
+    """
+    abs_min, abs_max = column_range(df["绝对值增长"])
+    yoy_min, yoy_max = column_range(df["同比"])
+
+    page = df.iloc[start:start + rows] if rows is not None else df.iloc[start:]
+    n = len(page)
+    if figsize is None:
+        figsize = (13.5, 5.2 * (n + 1) / 14)
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis("off")
+
+    x0 = 0.00
+    x_country = 0.22
+    x_y25 = 0.38
+    x_abs = 0.70
+    x3 = 1.00
+
+    top = 0.96
+    bottom = 0.04
+    total_h = top - bottom
+    row_h = total_h / (n + 1)
+
+    grid = "#e5e7eb"
+    header_bg = "#f3f4f6"
+    text_c = "#111827"
+
+    ax.add_patch(Rectangle((x0, top - row_h), x3 - x0, row_h, facecolor=header_bg, edgecolor="none"))
+
+    col_edges = [x0, x_country, x_y25, x_abs, x3]
+    row_edges = top - np.arange(n + 2) * row_h
+    grid_segments = (
+        [[(xx, bottom), (xx, top)] for xx in col_edges]
+        + [[(x0, y), (x3, y)] for y in row_edges]
+    )
+    ax.add_collection(LineCollection(grid_segments, colors=grid, linewidths=1.0))
+
+    headers = ["国家", "Y25达成", "绝对值增长", "同比"]
+    for (xa, xb), name in zip(zip(col_edges[:-1], col_edges[1:]), headers):
+        ax.text((xa + xb) / 2, top - row_h / 2, name, ha="center", va="center", fontsize=11, color=text_c, weight="bold")
+
+    yC = top - (np.arange(n) + 1.5) * row_h
+
+    # 数据条：两列合成一个 PolyCollection，零线合成一个 LineCollection
+    bar_h = row_h * 0.32
+    zero_segments, bar_verts, bar_pos = [], [], []
+    for col, (xL, xR), (lo, hi) in [
+        ("绝对值增长", (x_y25, x_abs), (abs_min, abs_max)),
+        ("同比", (x_abs, x3), (yoy_min, yoy_max)),
+    ]:
+        zx, left, width, is_pos = databar_geometry(page[col].to_numpy(), xL, xR, row_h, lo, hi)
+        zero_segments.append(np.stack([
+            np.c_[np.full(n, zx), yC - row_h * 0.35],
+            np.c_[np.full(n, zx), yC + row_h * 0.35],
+        ], axis=1))
+        keep = width > 0
+        bar_verts.append(rect_verts(left[keep], (yC - bar_h / 2)[keep], width[keep], np.full(keep.sum(), bar_h)))
+        bar_pos.append(is_pos[keep])
+
+    ax.add_collection(LineCollection(np.concatenate(zero_segments), colors="#d1d5db", linewidths=0.6, zorder=1))
+    bar_pos = np.concatenate(bar_pos)
+    ax.add_collection(PolyCollection(
+        np.concatenate(bar_verts),
+        facecolors=np.where(bar_pos[:, None], to_rgba(color_pos), to_rgba(color_neg)),
+        edgecolors="none", zorder=2
+    ))
+
+    # 文字按列批量生成：每列一个 TextColumn
+    text_kw = dict(va="center", fontsize=10.5, color=text_c)
+    columns = [
+        (x0 + 0.01, "left", [str(v) for v in page["国家"]]),
+        (x_y25 - 0.01, "right", [fmt_num(v) for v in page["Y25达成"].to_numpy()]),
+        (x_abs - 0.01, "right", [fmt_num(v) for v in page["绝对值增长"].to_numpy()]),
+        (x3 - 0.01, "right", [fmt_pct(float(v)) for v in page["同比"].to_numpy()]),
+    ]
+    for xx, ha, labels in columns:
+        ax.add_artist(TextColumn(xx, yC, labels, ha=ha, **text_kw))
+
+    fig.tight_layout()
+    return fig
+
+def databar_table_pages(df, page_rows=30, **kwargs):
+    """
+    按每页 page_rows 行逐页生成表格（生成器）。
+    取下一页（或生成器关闭）时关闭上一页的图形，pyplot 中始终只保留一页；
+    每页需在循环体内保存完毕。
+    """
+    for start in range(0, len(df), page_rows):
+        fig = draw_databar_table(df, start=start, rows=page_rows, **kwargs)
+        try:
+            yield fig
+        finally:
+            plt.close(fig)
+
+
+fig = draw_databar_table(df)
 plt.show()
-